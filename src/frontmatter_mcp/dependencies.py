@@ -5,7 +5,10 @@ Depends system. Each dependency is instantiated once on first use and
 cached for the lifetime of the application.
 """
 
-from frontmatter_mcp.files import FileRecordCache
+import threading
+
+from frontmatter_mcp.files import FileRecordCache, PostCache
+from frontmatter_mcp.query import FilesTableCache
 from frontmatter_mcp.semantic import SemanticContext, get_semantic_context
 from frontmatter_mcp.settings import Settings
 from frontmatter_mcp.settings import get_settings as _get_settings
@@ -14,6 +17,11 @@ from frontmatter_mcp.settings import get_settings as _get_settings
 _settings_cache: Settings | None = None
 _semantic_ctx_cache: SemanticContext | None = None
 _file_record_cache_instance: FileRecordCache | None = None
+_files_table_cache_instance: FilesTableCache | None = None
+_post_cache_instance: PostCache | None = None
+
+# Guards semantic context creation so the embedding model loads once
+_semantic_ctx_lock = threading.Lock()
 
 
 def get_settings() -> Settings:
@@ -32,23 +40,46 @@ def get_file_record_cache() -> FileRecordCache:
     return _file_record_cache_instance
 
 
+def get_files_table_cache() -> FilesTableCache:
+    """Get files table cache (singleton)."""
+    global _files_table_cache_instance
+    if _files_table_cache_instance is None:
+        _files_table_cache_instance = FilesTableCache()
+    return _files_table_cache_instance
+
+
+def get_post_cache() -> PostCache:
+    """Get parsed post cache for batch tools (singleton)."""
+    global _post_cache_instance
+    if _post_cache_instance is None:
+        _post_cache_instance = PostCache()
+    return _post_cache_instance
+
+
 def get_semantic_ctx() -> SemanticContext | None:
     """Get semantic context if enabled (singleton).
 
-    Returns None if semantic search is disabled.
+    Returns None if semantic search is disabled. Creation is serialized, since
+    concurrent tool calls would otherwise each build a context and load a
+    separate copy of the embedding model.
     """
     global _semantic_ctx_cache
     settings = get_settings()
     if not settings.enable_semantic:
         return None
     if _semantic_ctx_cache is None:
-        _semantic_ctx_cache = get_semantic_context(settings)
+        with _semantic_ctx_lock:
+            if _semantic_ctx_cache is None:
+                _semantic_ctx_cache = get_semantic_context(settings)
     return _semantic_ctx_cache
 
 
 def reset_caches() -> None:
     """Reset all singleton caches. Useful for testing."""
     global _settings_cache, _semantic_ctx_cache, _file_record_cache_instance
+    global _files_table_cache_instance, _post_cache_instance
     _settings_cache = None
     _semantic_ctx_cache = None
     _file_record_cache_instance = None
+    _files_table_cache_instance = None
+    _post_cache_instance = None
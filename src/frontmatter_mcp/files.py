@@ -1,5 +1,14 @@
 """Frontmatter read/write module."""
 
+import fnmatch
+import os
+import re
+import stat
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, NamedTuple
 
@@ -8,39 +17,77 @@ import frontmatter
 # Type alias for frontmatter parse result
 FileRecord = dict[str, Any]
 
+# Directories modified this recently are listed but not cached, since another
+# change within the same timestamp tick would leave their mtime unchanged
+RACY_MTIME_WINDOW_NS = 2_000_000_000
+
+_GLOB_MAGIC = re.compile(r"[*?[]")
+
 
 class FileRecordCacheEntry(NamedTuple):
-    """Cache entry storing mtime and parsed record."""
+    """Cache entry storing file signature and parsed record."""
 
-    mtime: float
+    mtime_ns: int
+    size: int
     record: FileRecord
 
 
 class FileRecordCache:
-    """mtime-based in-memory frontmatter cache."""
+    """mtime/size-based in-memory frontmatter cache.
+
+    Entries are keyed on (st_mtime_ns, st_size), so rewrites within the same
+    float-second mtime or that change the file length are still detected.
+    """
 
     def __init__(self) -> None:
         self._cache: dict[str, FileRecordCacheEntry] = {}
 
-    def get(self, path: Path, base_dir: Path) -> FileRecord | None:
-        """Return cached record if valid, None otherwise."""
+    def get(
+        self, path: Path, base_dir: Path, st: os.stat_result | None = None
+    ) -> FileRecord | None:
+        """Return cached record if valid, None otherwise.
+
+        Args:
+            path: Absolute path to the file.
+            base_dir: Base directory for relative path calculation.
+            st: Current stat result of path, if already known.
+        """
         rel_path = str(path.relative_to(base_dir))
-        try:
-            mtime = path.stat().st_mtime
-        except FileNotFoundError:
-            return None
-        if (entry := self._cache.get(rel_path)) and entry.mtime == mtime:
+        if st is None:
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                return None
+        if (
+            (entry := self._cache.get(rel_path))
+            and entry.mtime_ns == st.st_mtime_ns
+            and entry.size == st.st_size
+        ):
             return entry.record
         return None
 
-    def set(self, path: Path, base_dir: Path, record: FileRecord) -> None:
-        """Add or update cache entry."""
+    def set(
+        self,
+        path: Path,
+        base_dir: Path,
+        record: FileRecord,
+        st: os.stat_result | None = None,
+    ) -> None:
+        """Add or update cache entry.
+
+        Args:
+            path: Absolute path to the file.
+            base_dir: Base directory for relative path calculation.
+            record: Parsed record.
+            st: Stat result taken before the file was parsed, if known.
+        """
         rel_path = str(path.relative_to(base_dir))
-        try:
-            mtime = path.stat().st_mtime
-        except FileNotFoundError:
-            return
-        self._cache[rel_path] = FileRecordCacheEntry(mtime, record)
+        if st is None:
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                return
+        self._cache[rel_path] = FileRecordCacheEntry(st.st_mtime_ns, st.st_size, record)
 
     def invalidate(self, paths: list[Path], base_dir: Path) -> None:
         """Remove cache entries for specified paths."""
@@ -49,6 +96,338 @@ class FileRecordCache:
             self._cache.pop(rel_path, None)
 
 
+class PostCacheEntry(NamedTuple):
+    """Cache entry storing file signature and parsed post."""
+
+    mtime_ns: int
+    size: int
+    post: frontmatter.Post
+
+
+class PostCache:
+    """mtime/size-based LRU cache of parsed posts for read-modify-write.
+
+    Unlike FileRecordCache, entries hold the full post (metadata and body) so
+    a file can be rewritten without re-reading it. Cached posts are shared and
+    must not be mutated; write_property copies only the top-level metadata, so
+    files that end up unchanged are never copied at all.
+
+    A stale post here would be written back over the newer file, so posts are
+    only cached once their mtime is older than RACY_MTIME_WINDOW_NS: a later
+    edit within the same timestamp tick could otherwise keep the signature.
+    Written files are always that recent, so writes drop the entry.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self._maxsize = maxsize
+        self._cache: OrderedDict[Path, PostCacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: Path) -> frontmatter.Post:
+        """Load a post, reusing the cached parse if the file is unchanged.
+
+        Args:
+            path: Absolute path to the file.
+
+        Returns:
+            Parsed post, shared with the cache (read-only).
+        """
+        st = path.stat()
+        with self._lock:
+            entry = self._cache.get(path)
+            if (
+                entry is not None
+                and entry.mtime_ns == st.st_mtime_ns
+                and entry.size == st.st_size
+            ):
+                self._cache.move_to_end(path)
+                return entry.post
+
+        post = _load_post(path)
+
+        with self._lock:
+            if time.time_ns() - st.st_mtime_ns > RACY_MTIME_WINDOW_NS:
+                self._cache[path] = PostCacheEntry(st.st_mtime_ns, st.st_size, post)
+                self._cache.move_to_end(path)
+                while len(self._cache) > self._maxsize:
+                    self._cache.popitem(last=False)
+            else:
+                self._cache.pop(path, None)
+        return post
+
+    def write_property(
+        self, post: frontmatter.Post, path: Path, key: str, value: Any
+    ) -> None:
+        """Write post with one property set, leaving post itself unchanged.
+
+        Args:
+            post: Post returned by get.
+            path: Absolute path to the file.
+            key: Property name.
+            value: New property value.
+        """
+        self.dump(_with_metadata(post, {**post.metadata, key: value}), path)
+
+    def dump(self, post: frontmatter.Post, path: Path) -> None:
+        """Write a post to path and drop its cache entry.
+
+        Args:
+            post: Post to write.
+            path: Absolute path to the file.
+        """
+        with self._lock:
+            self._cache.pop(path, None)
+        _dump_atomic(post, path)
+
+
+def scan_files(base_dir: Path, suffix: str = ".md") -> list[Path]:
+    """Recursively collect files with the given suffix under base_dir.
+
+    Walks the tree with os.scandir so file/directory checks are served from
+    the directory entries instead of a stat call per path. Symlinked
+    directories are not followed.
+
+    Args:
+        base_dir: Directory to walk.
+        suffix: File name suffix to match.
+
+    Returns:
+        List of absolute paths to matching files.
+    """
+    results: list[Path] = []
+    stack = [os.fspath(base_dir)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith(suffix) and entry.is_file():
+                        results.append(Path(entry.path))
+        except OSError:
+            continue
+    return results
+
+
+class DirectoryEntry(NamedTuple):
+    """Directory entry with symlink-following type checks."""
+
+    name: str
+    is_dir: bool
+    is_file: bool
+
+
+class DirectoryListing(NamedTuple):
+    """Directory contents at a given mtime."""
+
+    mtime_ns: int
+    entries: tuple[DirectoryEntry, ...]
+
+
+class DirectoryListingCache:
+    """mtime-based in-memory cache of directory listings.
+
+    Adding, removing or renaming an entry updates the directory's mtime, so a
+    listing stays valid for as long as the mtime is unchanged.
+    """
+
+    def __init__(self) -> None:
+        self._cache: dict[str, DirectoryListing] = {}
+
+    def list(self, directory: str) -> tuple[tuple[int, int], DirectoryListing] | None:
+        """List a directory, reusing the cached listing if still valid.
+
+        Args:
+            directory: Directory path.
+
+        Returns:
+            Tuple of ((st_dev, st_ino), listing), or None if directory is not
+            a readable directory.
+        """
+        try:
+            st = os.stat(directory)
+        except OSError:
+            return None
+        if not stat.S_ISDIR(st.st_mode):
+            return None
+        identity = (st.st_dev, st.st_ino)
+
+        cached = self._cache.get(directory)
+        if cached is not None and cached.mtime_ns == st.st_mtime_ns:
+            return identity, cached
+
+        entries: list[DirectoryEntry] = []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                        is_file = not is_dir and entry.is_file()
+                    except OSError:
+                        continue
+                    entries.append(DirectoryEntry(entry.name, is_dir, is_file))
+        except OSError:
+            return None
+
+        listing = DirectoryListing(st.st_mtime_ns, tuple(entries))
+        if time.time_ns() - st.st_mtime_ns > RACY_MTIME_WINDOW_NS:
+            self._cache[directory] = listing
+        return identity, listing
+
+
+_directory_listing_cache = DirectoryListingCache()
+
+
+@lru_cache(maxsize=256)
+def _compile_segment(segment: str) -> re.Pattern[str]:
+    """Compile a glob path segment into a regex."""
+    return re.compile(fnmatch.translate(os.path.normcase(segment)))
+
+
+def glob_files(
+    base_dir: Path,
+    pattern: str,
+    cache: DirectoryListingCache | None = None,
+) -> list[Path]:
+    """Collect files matching a glob pattern relative to base_dir.
+
+    Matches like glob.glob(recursive=True) restricted to regular files:
+    "**" spans zero or more directories, and hidden names only match
+    segments that start with ".". Directory listings come from cache, so
+    unchanged directories cost one stat instead of a scan and per-file stats.
+
+    Args:
+        base_dir: Directory the pattern is relative to.
+        pattern: Glob pattern (e.g. "atoms/**/*.md").
+        cache: Directory listing cache. Defaults to a process-wide cache.
+
+    Returns:
+        List of matching file paths, without duplicates.
+    """
+    listings = cache if cache is not None else _directory_listing_cache
+    segments = [segment for segment in Path(pattern).parts if segment]
+    root = base_dir
+    if segments and Path(pattern).is_absolute():
+        root = Path(segments.pop(0))
+    # Literal leading directories are joined without listing their parents
+    while len(segments) > 1 and not _GLOB_MAGIC.search(segments[0]):
+        root = root / segments.pop(0)
+
+    results: dict[str, None] = {}
+    if segments:
+        _glob_segments(os.fspath(root), segments, 0, results, listings, set())
+    return [Path(path) for path in results]
+
+
+def _glob_segments(
+    directory: str,
+    segments: list[str],
+    index: int,
+    results: dict[str, None],
+    listings: DirectoryListingCache,
+    seen: set[tuple[int, int, int]],
+) -> None:
+    """Match segments[index:] under directory, adding files to results."""
+    segment = segments[index]
+    last = index == len(segments) - 1
+
+    if not _GLOB_MAGIC.search(segment):
+        path = os.path.join(directory, segment)
+        if last:
+            if os.path.isfile(path):
+                results[path] = None
+        else:
+            _glob_segments(path, segments, index + 1, results, listings, seen)
+        return
+
+    listed = listings.list(directory)
+    if listed is None:
+        return
+    identity, listing = listed
+
+    if segment == "**":
+        # Guard against symlink cycles while recursing
+        key = (*identity, index)
+        if key in seen:
+            return
+        seen.add(key)
+        if not last:
+            _glob_segments(directory, segments, index + 1, results, listings, seen)
+        for entry in listing.entries:
+            if entry.name.startswith("."):
+                continue
+            path = os.path.join(directory, entry.name)
+            if entry.is_dir:
+                _glob_segments(path, segments, index, results, listings, seen)
+            elif last and entry.is_file:
+                results[path] = None
+        return
+
+    regex = _compile_segment(segment)
+    include_hidden = segment.startswith(".")
+    for entry in listing.entries:
+        if not include_hidden and entry.name.startswith("."):
+            continue
+        if not regex.match(os.path.normcase(entry.name)):
+            continue
+        path = os.path.join(directory, entry.name)
+        if last:
+            if entry.is_file:
+                results[path] = None
+        elif entry.is_dir:
+            _glob_segments(path, segments, index + 1, results, listings, seen)
+
+
+def _load_post(path: Path) -> frontmatter.Post:
+    """Load a post from a UTF-8 file with a single read.
+
+    Equivalent to frontmatter.load, which reads through a codecs stream
+    reader; decoding the bytes directly is cheaper and, like codecs.open,
+    leaves line endings untouched.
+
+    Args:
+        path: Path to the file.
+
+    Returns:
+        Parsed post.
+    """
+    return frontmatter.loads(path.read_bytes().decode("utf-8"))
+
+
+def _load_metadata(path: Path) -> dict[str, Any]:
+    """Load only the frontmatter metadata of a file.
+
+    Files that start with a YAML fence are read line by line up to the
+    closing fence, so the body is never read or decoded. Files whose first
+    line opens no known frontmatter format have no metadata and stop there.
+    Anything else goes through the full parse.
+
+    Args:
+        path: Path to the file.
+
+    Returns:
+        Frontmatter metadata.
+    """
+    boundary = frontmatter.YAMLHandler.FM_BOUNDARY
+    post: frontmatter.Post | None = None
+    with open(path, "rb") as f:
+        lines = [f.readline()]
+        first = lines[0].decode("utf-8")
+        head = first.lstrip()
+        if head and not any(h.detect(head) for h in frontmatter.handlers):
+            return {}
+        if boundary.match(first):
+            for line in f:
+                lines.append(line)
+                if boundary.match(line.decode("utf-8")):
+                    post = frontmatter.loads(b"".join(lines).decode("utf-8"))
+                    break
+    if post is None:
+        post = _load_post(path)
+    metadata: dict[str, Any] = post.metadata
+    return metadata
+
+
 def parse_file(path: Path, base_dir: Path) -> FileRecord:
     """Parse frontmatter from a single file.
 
@@ -59,11 +438,10 @@ def parse_file(path: Path, base_dir: Path) -> FileRecord:
     Returns:
         Dictionary with 'path' (relative) and frontmatter properties.
     """
-    post = frontmatter.load(path)
     result: dict[str, Any] = {
         "path": str(path.relative_to(base_dir)),
     }
-    result.update(post.metadata)
+    result.update(_load_metadata(path))
     return result
 
 
@@ -86,8 +464,15 @@ def parse_files(
     warnings: list[dict[str, str]] = []
 
     for path in paths:
+        # Stat once; the same result validates the cache and keys the new
+        # entry, so a file changed while being parsed is re-read next time
+        try:
+            st: os.stat_result | None = path.stat()
+        except OSError:
+            st = None
+
         # Check cache first
-        if (record := cache.get(path, base_dir)) is not None:
+        if st is not None and (record := cache.get(path, base_dir, st)) is not None:
             records.append(record)
             continue
 
@@ -95,7 +480,8 @@ def parse_files(
         try:
             record = parse_file(path, base_dir)
             records.append(record)
-            cache.set(path, base_dir, record)
+            if st is not None:
+                cache.set(path, base_dir, record, st)
         except Exception as e:
             warnings.append(
                 {
@@ -112,39 +498,120 @@ def update_file(
     base_dir: Path,
     set_values: dict[str, Any] | None = None,
     unset: list[str] | None = None,
+    cache: PostCache | None = None,
 ) -> dict[str, Any]:
     """Update frontmatter in a single file.
 
+    The file is only rewritten if the update changes its frontmatter.
+
     Args:
         path: Absolute path to the file.
         base_dir: Base directory for relative path calculation.
         set_values: Properties to add or overwrite.
         unset: Property names to remove.
+        cache: Post cache to read from and invalidate on write, if any.
+
+    Returns:
+        Dictionary with 'path' (relative), 'frontmatter' (updated metadata) and
+        'skipped' (True if nothing changed and the file was not written).
+    """
+    post = cache.get(path) if cache is not None else _load_post(path)
+    metadata = _apply_changes(post.metadata, set_values, unset)
+
+    # Only write if there were changes
+    if metadata is not None:
+        updated = _with_metadata(post, metadata)
+        if cache is not None:
+            cache.dump(updated, path)
+        else:
+            _dump_atomic(updated, path)
+
+    return {
+        "path": str(path.relative_to(base_dir)),
+        "frontmatter": dict(post.metadata if metadata is None else metadata),
+        "skipped": metadata is None,
+    }
+
+
+def _apply_changes(
+    metadata: dict[str, Any],
+    set_values: dict[str, Any] | None,
+    unset: list[str] | None,
+) -> dict[str, Any] | None:
+    """Apply set/unset to a copy of metadata.
+
+    Args:
+        metadata: Current metadata. It is not modified.
+        set_values: Properties to add or overwrite.
+        unset: Property names to remove. Takes priority over set_values.
 
     Returns:
-        Dictionary with 'path' (relative) and 'frontmatter' (updated metadata).
+        Updated metadata, or None if the changes leave metadata as it is.
     """
-    post = frontmatter.load(path)
+    unset_keys = frozenset(unset or ())
+    updated: dict[str, Any] | None = None
 
     # Apply set values
-    if set_values:
-        for key, value in set_values.items():
-            # Skip if key is in unset (unset takes priority)
-            if unset and key in unset:
-                continue
-            post.metadata[key] = value
+    for key, value in (set_values or {}).items():
+        # Skip if key is in unset (unset takes priority)
+        if key in unset_keys:
+            continue
+        if key in metadata and _same_value(metadata[key], value):
+            continue
+        if updated is None:
+            updated = dict(metadata)
+        updated[key] = value
 
     # Apply unset
-    if unset:
-        for key in unset:
-            post.metadata.pop(key, None)
+    for key in unset_keys:
+        if key in metadata:
+            if updated is None:
+                updated = dict(metadata)
+            del updated[key]
 
-    # Only write if there were changes
-    if set_values or unset:
-        with open(path, "wb") as f:
+    return updated
+
+
+def _with_metadata(
+    post: frontmatter.Post, metadata: dict[str, Any]
+) -> frontmatter.Post:
+    """Return a new post with post's body and handler and the given metadata."""
+    updated = frontmatter.Post(post.content, post.handler)
+    updated.metadata = metadata
+    return updated
+
+
+def _dump_atomic(post: frontmatter.Post, path: Path) -> None:
+    """Write a post via a temporary file and os.replace.
+
+    Readers and crashes see either the old or the new file, never a partially
+    written one. The original file mode is kept. Like a plain write, this does
+    not fsync.
+
+    Args:
+        post: Post to write.
+        path: Absolute path to the (existing) file.
+    """
+    mode = stat.S_IMODE(path.stat().st_mode)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
             frontmatter.dump(post, f)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
 
-    return {
-        "path": str(path.relative_to(base_dir)),
-        "frontmatter": dict(post.metadata),
-    }
+
+def _same_value(current: Any, value: Any) -> bool:
+    """Check if setting value would leave current unchanged.
+
+    Types are compared too, since 1 == True but they serialize differently.
+    """
+    return type(current) is type(value) and current == value
@@ -1,11 +1,17 @@
 """DuckDB query execution module."""
 
 import json
-from typing import Any
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, NamedTuple
 
 import duckdb
 import pyarrow as pa
 
+# Shared encoder: skips json.dumps' per-call argument handling and encoder setup
+_encode_json = json.JSONEncoder(ensure_ascii=False).encode
+
 
 def _serialize_value(value: Any) -> str | None:
     """Serialize a value to string for DuckDB.
@@ -16,49 +22,235 @@ def _serialize_value(value: Any) -> str | None:
     if value is None:
         return None
     if isinstance(value, list):
-        return json.dumps(value, ensure_ascii=False)
+        return _encode_json(value)
     return str(value)
 
 
-def create_base_connection(records: list[dict[str, Any]]) -> duckdb.DuckDBPyConnection:
-    """Create a new in-memory DuckDB connection with files table.
-
-    Creates a files table with path and frontmatter columns.
+def build_files_table(records: list[dict[str, Any]]) -> pa.Table:
+    """Build the Arrow table backing the files table.
 
     Args:
         records: List of parsed frontmatter records.
 
     Returns:
-        DuckDB connection with files table.
+        Arrow table with path and frontmatter columns, all typed as string.
     """
-    conn = duckdb.connect(":memory:")
-
     if not records:
-        conn.execute("CREATE TABLE files (path TEXT)")
-        return conn
+        return pa.table({"path": pa.array([], type=pa.string())})
 
-    # Collect all unique keys across all records
-    all_keys: set[str] = set()
+    # Collect all unique keys across all records, in first-seen order
+    all_keys: dict[str, None] = {}
     for record in records:
-        all_keys.update(record.keys())
+        all_keys.update(dict.fromkeys(record))
 
-    # Build columns dict with serialized string values
-    columns_data: dict[str, list[str | None]] = {key: [] for key in all_keys}
-    for record in records:
-        for key in all_keys:
-            columns_data[key].append(_serialize_value(record.get(key)))
+    # Build one string array per column. None and plain strings (the common
+    # case for sparse frontmatter) are taken as-is without a function call.
+    serialize = _serialize_value
+    columns: dict[str, pa.Array] = {}
+    for key in all_keys:
+        values = [
+            value
+            if (value := record.get(key)) is None or type(value) is str
+            else serialize(value)
+            for record in records
+        ]
+        columns[key] = pa.array(values, type=pa.string())
+    return pa.table(columns)
+
+
+# Result column types whose Arrow to_pylist() values match fetchall() values.
+# Arrays and lists of these are also accepted. Temporal types are left out:
+# Arrow raises on BC and infinite dates and turns TIME '24:00:00' into 00:00,
+# where fetchall() returns them as strings or clamped values.
+_ARROW_ROW_TYPES = frozenset(
+    {
+        "VARCHAR",
+        "JSON",
+        "BOOLEAN",
+        "TINYINT",
+        "SMALLINT",
+        "INTEGER",
+        "BIGINT",
+        "UTINYINT",
+        "USMALLINT",
+        "UINTEGER",
+        "UBIGINT",
+        "FLOAT",
+        "DOUBLE",
+    }
+)
+_ARRAY_SUFFIX = re.compile(r"(\[\d*\])+$")
+
+
+def _arrow_rows_supported(types: list[Any]) -> bool:
+    """Check whether result rows can be built through Arrow."""
+    return all(
+        _ARRAY_SUFFIX.sub("", str(column_type)) in _ARROW_ROW_TYPES
+        for column_type in types
+    )
+
+
+_database: duckdb.DuckDBPyConnection | None = None
+_database_lock = threading.Lock()
+
+
+def _get_database() -> duckdb.DuckDBPyConnection:
+    """Get the process-wide in-memory database, creating it if necessary.
 
-    # Create pyarrow table with explicit string type for all columns
-    schema = pa.schema([(key, pa.string()) for key in all_keys])
-    table = pa.table(columns_data, schema=schema)
+    Extensions are loaded per database, and loading VSS verifies its
+    signature (~200 ms), so queries share one database instead of each
+    opening their own.
+    """
+    global _database
+    if _database is None:
+        with _database_lock:
+            if _database is None:
+                _database = duckdb.connect(":memory:")
+    return _database
+
+
+# Statement types whose effects stay inside the transaction a shared-database
+# query runs in. Anything else (COMMIT/ROLLBACK, ATTACH/DETACH, SET/PRAGMA,
+# LOAD, CALL, ...) can change state that later queries would see.
+_TRANSACTIONAL_STATEMENTS = frozenset(
+    {
+        "SELECT",
+        "EXPLAIN",
+        "CREATE",
+        "INSERT",
+        "UPDATE",
+        "DELETE",
+        "DROP",
+        "ALTER",
+    }
+)
+# Secrets live in the database instance, outside any transaction
+_CREATE_SECRET = re.compile(
+    r"(?:\s|--[^\n]*|/\*.*?\*/)*CREATE\s+(?:OR\s+REPLACE\s+)?"
+    r"(?:PERSISTENT\s+|TEMP(?:ORARY)?\s+)?SECRET\b",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def needs_private_database(sql: str) -> bool:
+    """Check whether a query must run in a database of its own.
+
+    Args:
+        sql: SQL query string.
+
+    Returns:
+        True if any statement can change state outside its transaction, or
+        if the SQL does not parse (execution reports the error).
+    """
+    try:
+        statements = duckdb.extract_statements(sql)
+    except duckdb.Error:
+        return True
+    return any(
+        statement.type.name not in _TRANSACTIONAL_STATEMENTS
+        or _CREATE_SECRET.match(statement.query)
+        for statement in statements
+    )
+
+
+def create_connection(
+    table: pa.Table, private: bool = False
+) -> duckdb.DuckDBPyConnection:
+    """Create an isolated DuckDB connection from a prebuilt files table.
+
+    By default the connection is a cursor on the shared in-memory database
+    with an open transaction. The files table is temporary and UDFs are per
+    cursor, and anything the query itself creates or changes is rolled back
+    when the connection is closed. That only holds for statements that stay
+    inside the transaction, so queries for which needs_private_database()
+    is true must pass private=True to get a fresh in-memory database instead,
+    with no transaction opened, as every query had before the database was
+    shared.
+
+    Args:
+        table: Arrow table built by build_files_table.
+        private: Open a fresh database instead of sharing the process-wide one.
+
+    Returns:
+        DuckDB connection with files table.
+    """
+    if private:
+        conn = duckdb.connect(":memory:")
+    else:
+        conn = _get_database().cursor()
+        conn.execute("BEGIN TRANSACTION")
 
     # Register and create actual table (not view)
     conn.register("_temp_source", table)
-    conn.execute("CREATE TABLE files AS SELECT * FROM _temp_source")
+    conn.execute("CREATE TEMP TABLE files AS SELECT * FROM _temp_source")
+    conn.unregister("_temp_source")
 
     return conn
 
 
+def create_base_connection(
+    records: list[dict[str, Any]], private: bool = False
+) -> duckdb.DuckDBPyConnection:
+    """Create a new in-memory DuckDB connection with files table.
+
+    Creates a files table with path and frontmatter columns.
+
+    Args:
+        records: List of parsed frontmatter records.
+        private: Open a fresh database instead of sharing the process-wide one.
+
+    Returns:
+        DuckDB connection with files table.
+    """
+    return create_connection(build_files_table(records), private)
+
+
+class FilesTableCacheEntry(NamedTuple):
+    """Cache entry storing the records a table was built from."""
+
+    records: list[dict[str, Any]]
+    table: pa.Table
+
+
+class FilesTableCache:
+    """Glob-keyed cache of Arrow tables built from parsed records.
+
+    Records returned by FileRecordCache are reused as-is while files are
+    unchanged, so an entry is valid as long as the same record objects come
+    back in the same order.
+    """
+
+    def __init__(self, maxsize: int = 16) -> None:
+        self._maxsize = maxsize
+        self._entries: OrderedDict[str, FilesTableCacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, glob: str, records: list[dict[str, Any]]) -> pa.Table:
+        """Return the cached table for glob, rebuilding it if records changed."""
+        with self._lock:
+            entry = self._entries.get(glob)
+            if entry is not None and _same_records(entry.records, records):
+                self._entries.move_to_end(glob)
+                return entry.table
+
+        table = build_files_table(records)
+
+        with self._lock:
+            self._entries[glob] = FilesTableCacheEntry(records, table)
+            self._entries.move_to_end(glob)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+        return table
+
+
+def _same_records(cached: list[dict[str, Any]], current: list[dict[str, Any]]) -> bool:
+    """Check whether two record lists hold the same objects in the same order."""
+    return len(cached) == len(current) and all(
+        a is b for a, b in zip(cached, current, strict=True)
+    )
+
+
 def execute_query(conn: duckdb.DuckDBPyConnection, sql: str) -> dict[str, Any]:
     """Execute SQL query on prepared connection.
 
@@ -71,10 +263,14 @@ def execute_query(conn: duckdb.DuckDBPyConnection, sql: str) -> dict[str, Any]:
     """
     result = conn.execute(sql)
     columns = [desc[0] for desc in result.description]
-    rows = result.fetchall()
 
-    # Convert to list of dicts
-    results = [dict(zip(columns, row, strict=True)) for row in rows]
+    # Convert to list of dicts. Arrow builds the row dicts in C; other column
+    # types (MAP, STRUCT, DECIMAL, DATE, ...) convert differently there, so they
+    # keep the fetchall() path.
+    if _arrow_rows_supported([desc[1] for desc in result.description]):
+        results = result.fetch_arrow_table().to_pylist()
+    else:
+        results = [dict(zip(columns, row, strict=True)) for row in result.fetchall()]
 
     return {
         "results": results,
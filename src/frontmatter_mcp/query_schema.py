@@ -1,6 +1,6 @@
 """Query schema module for DuckDB table column information."""
 
-from collections import defaultdict
+from dataclasses import dataclass, field
 from typing import Any, NotRequired, TypedDict
 
 
@@ -16,6 +16,16 @@ class ColumnInfo(TypedDict):
 Schema = dict[str, ColumnInfo]
 
 
+@dataclass(slots=True)
+class _ColumnStats:
+    """Running aggregates for one column while scanning records."""
+
+    count: int = 0
+    is_array: bool = False
+    seen: set[str] = field(default_factory=set)
+    samples: list[Any] = field(default_factory=list)
+
+
 def create_base_schema(records: list[dict[str, Any]], max_samples: int = 5) -> Schema:
     """Create base schema with path and frontmatter columns.
 
@@ -29,41 +39,40 @@ def create_base_schema(records: list[dict[str, Any]], max_samples: int = 5) -> S
     Returns:
         Schema dict with path and frontmatter columns.
     """
-    schema: Schema = {}
-    property_values: dict[str, list[Any]] = defaultdict(list)
+    stats: dict[str, _ColumnStats] = {}
 
+    # Stream records once, keeping only running aggregates per column
     for record in records:
         for key, value in record.items():
-            property_values[key].append(value)
+            column = stats.get(key)
+            if column is None:
+                column = stats[key] = _ColumnStats()
+            if value is None:
+                continue
+            column.count += 1
+            if not column.is_array and isinstance(value, list):
+                column.is_array = True
+            # Dedupe by str() as queries see every value as a string (so 1 and
+            # '1' are one sample); keys are only built until samples are full
+            if len(column.samples) < max_samples:
+                sample_key = str(value)
+                if sample_key not in column.seen:
+                    column.seen.add(sample_key)
+                    column.samples.append(value)
 
     total_files = len(records)
-
-    for prop, values in property_values.items():
-        non_null_values = [v for v in values if v is not None]
-        count = len(non_null_values)
-
+    schema: Schema = {}
+    for prop, column in stats.items():
         # path is never nullable
         if prop == "path":
             nullable = False
         else:
-            nullable = count < total_files
-
-        # Detect if values are arrays
-        is_array = any(isinstance(v, list) for v in non_null_values)
-
-        # Collect unique sample values
-        seen: set[str] = set()
-        samples: list[Any] = []
-        for v in non_null_values:
-            key = str(v)
-            if key not in seen and len(samples) < max_samples:
-                seen.add(key)
-                samples.append(v)
+            nullable = column.count < total_files
 
         schema[prop] = ColumnInfo(
-            type="array" if is_array else "string",
+            type="array" if column.is_array else "string",
             nullable=nullable,
-            examples=samples,
+            examples=column.samples,
         )
 
     return schema
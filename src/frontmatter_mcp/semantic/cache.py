@@ -1,20 +1,39 @@
 """Cache module for embedding storage using DuckDB."""
 
 from pathlib import Path
+from typing import Any, Literal
 
 import duckdb
 import numpy as np
+import pyarrow as pa
+from numpy.typing import NDArray
 
 from frontmatter_mcp.semantic.model import EmbeddingModel
 
 # Cache database filename
 CACHE_DB_NAME = "embeddings.duckdb"
 
+# On-disk vector encodings. int8 stores a symmetric per-vector quantization
+# (vector ~= q * scale), a quarter of the float32 size.
+StorageDtype = Literal["float32", "int8"]
+DEFAULT_STORAGE_DTYPE: StorageDtype = "float32"
+
+_COLUMN_TYPES: dict[str, str] = {"float32": "FLOAT", "int8": "TINYINT"}
+
+# (st_mtime_ns, st_size) of the database and its WAL file; None if missing
+FileSignature = tuple[tuple[int, int] | None, tuple[int, int] | None]
+EmbeddingMatrix = tuple[list[str], NDArray[np.float32]]
+
 
 class EmbeddingCache:
     """DuckDB-based cache for document embeddings."""
 
-    def __init__(self, cache_dir: Path, model: EmbeddingModel) -> None:
+    def __init__(
+        self,
+        cache_dir: Path,
+        model: EmbeddingModel,
+        storage_dtype: StorageDtype = DEFAULT_STORAGE_DTYPE,
+    ) -> None:
         """Initialize the embedding cache.
 
         The database connection is lazy-initialized on first access.
@@ -23,10 +42,14 @@ class EmbeddingCache:
         Args:
             cache_dir: Directory to store the cache database.
             model: Embedding model (used for model name and dimension).
+            storage_dtype: On-disk vector encoding. Vectors are always
+                returned as float32.
         """
         self._cache_dir = cache_dir
         self._model = model
+        self._storage_dtype = storage_dtype
         self._conn: duckdb.DuckDBPyConnection | None = None
+        self._snapshot: tuple[FileSignature, EmbeddingMatrix] | None = None
 
     @property
     def cache_path(self) -> Path:
@@ -52,15 +75,6 @@ class EmbeddingCache:
         """Initialize database schema."""
         dim = self._model.get_dimension()
 
-        # Create embeddings table
-        self.conn.execute(f"""
-            CREATE TABLE IF NOT EXISTS embeddings (
-                path TEXT PRIMARY KEY,
-                mtime DOUBLE,
-                vector FLOAT[{dim}]
-            )
-        """)
-
         # Create metadata table
         self.conn.execute("""
             CREATE TABLE IF NOT EXISTS metadata (
@@ -69,6 +83,29 @@ class EmbeddingCache:
             )
         """)
 
+        # Storage dtype changed: vectors are re-encoded by the indexer
+        result = self.conn.execute(
+            "SELECT value FROM metadata WHERE key = 'storage_dtype'"
+        ).fetchone()
+        stored_dtype = result[0] if result is not None else DEFAULT_STORAGE_DTYPE
+        if stored_dtype != self._storage_dtype:
+            self.conn.execute("DROP TABLE IF EXISTS embeddings")
+        self.conn.execute(
+            "INSERT OR REPLACE INTO metadata (key, value) VALUES ('storage_dtype', ?)",
+            [self._storage_dtype],
+        )
+
+        # Create embeddings table
+        column_type = _COLUMN_TYPES[self._storage_dtype]
+        scale_column = ", scale FLOAT" if self._storage_dtype == "int8" else ""
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                path TEXT PRIMARY KEY,
+                mtime DOUBLE,
+                vector {column_type}[{dim}]{scale_column}
+            )
+        """)
+
         # Store model info if not exists
         result = self.conn.execute(
             "SELECT value FROM metadata WHERE key = 'model_name'"
@@ -102,6 +139,11 @@ class EmbeddingCache:
                 [str(self._model.get_dimension())],
             )
 
+    @property
+    def _scale_column(self) -> str:
+        """SQL expression selecting the per-vector dequantization scale."""
+        return "scale" if self._storage_dtype == "int8" else "1.0::FLOAT"
+
     def clear(self) -> None:
         """Clear all cached embeddings."""
         self.conn.execute("DELETE FROM embeddings")
@@ -116,13 +158,15 @@ class EmbeddingCache:
             Tuple of (mtime, vector) if cached, None otherwise.
         """
         result = self.conn.execute(
-            "SELECT mtime, vector FROM embeddings WHERE path = ?", [path]
+            f"SELECT mtime, vector, {self._scale_column} FROM embeddings "
+            "WHERE path = ?",
+            [path],
         ).fetchone()
 
         if result is None:
             return None
 
-        return result[0], np.array(result[1])
+        return result[0], np.array(result[1], dtype=np.float32) * result[2]
 
     def set(self, path: str, mtime: float, vector: np.ndarray) -> None:
         """Store embedding for a path.
@@ -132,6 +176,18 @@ class EmbeddingCache:
             mtime: File modification time.
             vector: Embedding vector.
         """
+        if self._storage_dtype == "int8":
+            scale = float(np.abs(vector).max()) / 127 or 1.0
+            quantized = np.rint(vector / scale).astype(np.int8)
+            self.conn.execute(
+                """
+                INSERT OR REPLACE INTO embeddings (path, mtime, vector, scale)
+                VALUES (?, ?, ?, ?)
+                """,
+                [path, mtime, quantized.tolist(), scale],
+            )
+            return
+
         self.conn.execute(
             """
             INSERT OR REPLACE INTO embeddings (path, mtime, vector)
@@ -140,6 +196,46 @@ class EmbeddingCache:
             [path, mtime, vector.tolist()],
         )
 
+    def set_many(self, items: list[tuple[str, float, np.ndarray]]) -> None:
+        """Store several embeddings with a single INSERT statement.
+
+        Vectors are stacked into one matrix and handed to DuckDB as an Arrow
+        table, so the batch is inserted (and quantized) without per-row
+        statements or Python lists.
+
+        Args:
+            items: Tuples of (path, mtime, vector) with distinct paths.
+        """
+        if not items:
+            return
+        paths, mtimes, vectors = zip(*items, strict=True)
+        matrix = np.stack(vectors).astype(np.float32, copy=False)
+        dim = matrix.shape[1]
+        columns: dict[str, Any] = {"path": list(paths), "mtime": list(mtimes)}
+
+        if self._storage_dtype == "int8":
+            scales = np.abs(matrix).max(axis=1) / 127
+            scales[scales == 0] = 1.0
+            quantized = np.rint(matrix / scales[:, np.newaxis]).astype(np.int8)
+            columns["vector"] = pa.FixedSizeListArray.from_arrays(
+                pa.array(quantized.ravel()), dim
+            )
+            columns["scale"] = pa.array(scales.astype(np.float32))
+        else:
+            columns["vector"] = pa.FixedSizeListArray.from_arrays(
+                pa.array(matrix.ravel()), dim
+            )
+
+        self.conn.register("_new_embeddings", pa.table(columns))
+        try:
+            names = ", ".join(columns)
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO embeddings ({names}) "
+                f"SELECT {names} FROM _new_embeddings"
+            )
+        finally:
+            self.conn.unregister("_new_embeddings")
+
     def delete(self, path: str) -> None:
         """Delete cached embedding for a path.
 
@@ -166,15 +262,7 @@ class EmbeddingCache:
         Returns:
             List of paths that are new or have changed.
         """
-        cached = self.get_all_paths_with_mtime()
-        stale = []
-
-        for path, mtime in current_files.items():
-            cached_mtime = cached.get(path)
-            if cached_mtime is None or cached_mtime < mtime:
-                stale.append(path)
-
-        return stale
+        return self.get_changes(current_files)[0]
 
     def get_deleted_paths(self, current_files: dict[str, float]) -> list[str]:
         """Get paths that are cached but no longer exist.
@@ -185,9 +273,37 @@ class EmbeddingCache:
         Returns:
             List of paths that should be removed from cache.
         """
+        return self.get_changes(current_files)[1]
+
+    def get_changes(
+        self, current_files: dict[str, float]
+    ) -> tuple[list[str], list[str]]:
+        """Get stale and deleted paths from a single read of cached mtimes.
+
+        Args:
+            current_files: Dictionary mapping path to current mtime.
+
+        Returns:
+            Tuple of (stale paths, deleted paths). Stale paths are new or have
+            a newer mtime than cached; deleted paths are cached but gone.
+        """
         cached = self.get_all_paths_with_mtime()
-        current_paths = set(current_files.keys())
-        return [path for path in cached if path not in current_paths]
+        stale = [
+            path
+            for path, mtime in current_files.items()
+            if (cached_mtime := cached.get(path)) is None or cached_mtime < mtime
+        ]
+        deleted = [path for path in cached if path not in current_files]
+        return stale, deleted
+
+    def delete_many(self, paths: list[str]) -> None:
+        """Delete cached embeddings for several paths in one statement.
+
+        Args:
+            paths: File paths.
+        """
+        if paths:
+            self.conn.execute("DELETE FROM embeddings WHERE path IN ?", [paths])
 
     def count(self) -> int:
         """Get the number of cached embeddings.
@@ -204,34 +320,95 @@ class EmbeddingCache:
         Returns:
             Dictionary mapping path to embedding vector.
         """
-        results = self.conn.execute("SELECT path, vector FROM embeddings").fetchall()
-        return {row[0]: np.array(row[1]) for row in results}
+        results = self.conn.execute(
+            f"SELECT path, vector, {self._scale_column} FROM embeddings"
+        ).fetchall()
+        return {row[0]: np.array(row[1], dtype=np.float32) * row[2] for row in results}
 
     def get_all_readonly(self) -> dict[str, np.ndarray]:
         """Get all cached embeddings using a read-only connection.
 
-        This method opens a separate read-only connection to avoid lock
-        conflicts when another process holds the write lock.
+        Dictionary adapter over get_matrix_readonly(); the values are row
+        views into the shared matrix.
 
         Returns:
             Dictionary mapping path to embedding vector.
             Empty dict if database doesn't exist or is locked.
         """
-        if not self.cache_path.exists():
-            return {}
+        paths, matrix = self.get_matrix_readonly()
+        return dict(zip(paths, matrix, strict=True))
+
+    def _file_signature(self) -> FileSignature:
+        """Get the on-disk signature of the database and its WAL."""
+
+        def signature(path: Path) -> tuple[int, int] | None:
+            try:
+                st = path.stat()
+            except OSError:
+                return None
+            return st.st_mtime_ns, st.st_size
+
+        wal_path = self.cache_path.with_name(self.cache_path.name + ".wal")
+        return signature(self.cache_path), signature(wal_path)
+
+    def get_matrix_readonly(self) -> EmbeddingMatrix:
+        """Get all cached embeddings as one contiguous matrix.
+
+        This method opens a separate read-only connection to avoid lock
+        conflicts when another process holds the write lock. Vectors are
+        fetched as an Arrow fixed-size list column and reshaped without
+        per-row conversion.
+
+        The result is memoized until the database or WAL file changes on
+        disk, so repeated queries skip reopening the database. If it is
+        locked, the last snapshot (if any) is returned.
+
+        Returns:
+            Tuple of (paths, matrix) where matrix has shape (N, dim) and
+            row i is the embedding of paths[i]. The matrix is read-only.
+            Empty if database doesn't exist or is locked.
+        """
+        empty: EmbeddingMatrix = ([], np.empty((0, 0), dtype=np.float32))
+        signature = self._file_signature()
+        if signature[0] is None:
+            return empty
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot[0] == signature:
+            return snapshot[1]
+
         try:
             with duckdb.connect(str(self.cache_path), read_only=True) as conn:
-                results = conn.execute("SELECT path, vector FROM embeddings").fetchall()
-                return {row[0]: np.array(row[1]) for row in results}
+                table = conn.execute(
+                    f"SELECT path, vector, {self._scale_column} AS scale "
+                    "FROM embeddings"
+                ).fetch_arrow_table()
         except (
             duckdb.IOException,
             duckdb.CatalogException,
+            duckdb.BinderException,
             duckdb.ConnectionException,
         ):
             # IOException: database is locked by another process
             # CatalogException: embeddings table doesn't exist yet
+            # BinderException: table was written with another storage dtype
             # ConnectionException: can't open read-only while write connection exists
-            return {}
+            return snapshot[1] if snapshot is not None else empty
+
+        result = empty
+        if table.num_rows > 0:
+            vectors = table.column("vector").combine_chunks()
+            matrix = np.ascontiguousarray(
+                vectors.flatten().to_numpy().reshape(-1, vectors.type.list_size),
+                dtype=np.float32,
+            )
+            if self._storage_dtype == "int8":
+                scales = table.column("scale").to_numpy().astype(np.float32)
+                matrix = matrix * scales[:, np.newaxis]
+            matrix.setflags(write=False)
+            result = (table.column("path").to_pylist(), matrix)
+
+        self._snapshot = (signature, result)
+        return result
 
     def close(self) -> None:
         """Close the database connection."""
@@ -3,6 +3,7 @@
 from dataclasses import dataclass
 from pathlib import Path
 
+from frontmatter_mcp.files import scan_files
 from frontmatter_mcp.semantic.cache import EmbeddingCache
 from frontmatter_mcp.semantic.indexer import EmbeddingIndexer, IndexerState
 from frontmatter_mcp.semantic.model import EmbeddingModel
@@ -36,10 +37,14 @@ def get_semantic_context(settings: Settings) -> SemanticContext:
         SemanticContext with model, cache, and indexer.
     """
     model = EmbeddingModel(settings.embedding_model)
-    cache = EmbeddingCache(cache_dir=settings.cache_dir, model=model)
+    cache = EmbeddingCache(
+        cache_dir=settings.cache_dir,
+        model=model,
+        storage_dtype=settings.embedding_storage,
+    )
 
     def get_files() -> list[Path]:
-        return list(settings.base_dir.rglob("*.md"))
+        return scan_files(settings.base_dir)
 
     indexer = EmbeddingIndexer(cache, model, get_files, settings.base_dir)
 
@@ -1,6 +1,8 @@
 """Embedding indexer module for background embedding generation."""
 
+import os
 import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from enum import Enum
 from pathlib import Path
 from typing import Any, Callable
@@ -10,6 +12,12 @@ import frontmatter
 from frontmatter_mcp.semantic.cache import EmbeddingCache
 from frontmatter_mcp.semantic.model import EmbeddingModel
 
+# Number of stale files encoded per model call
+INDEX_CHUNK_SIZE = 64
+
+# Worker threads for overlapping stat and file reads
+INDEX_IO_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
 
 class IndexerState(Enum):
     """State of the embedding indexer."""
@@ -88,52 +96,132 @@ class EmbeddingIndexer:
             files: List of files to index.
         """
         try:
-            self._index_files(files)
+            with ThreadPoolExecutor(
+                max_workers=INDEX_IO_WORKERS, thread_name_prefix="indexer-io"
+            ) as pool:
+                self._index_files(files, pool)
         finally:
             self._cache.close()
             with self._lock:
                 self._state = IndexerState.READY
 
-    def _index_files(self, files: list[Path]) -> None:
+    def _index_files(self, files: list[Path], pool: ThreadPoolExecutor) -> None:
         """Index the given files.
 
         Args:
             files: List of files to index.
+            pool: Executor for stat and file reads.
         """
         # Build current file map with mtime
-        current_files: dict[str, float] = {}
-        for file_path in files:
-            try:
-                rel_path = str(file_path.relative_to(self._base_dir))
-                mtime = file_path.stat().st_mtime
-                current_files[rel_path] = mtime
-            except (ValueError, OSError):
-                continue
+        current_files = dict(
+            entry for entry in pool.map(self._stat_file, files) if entry is not None
+        )
 
-        # Find stale and deleted paths
-        stale_paths = self._cache.get_stale_paths(current_files)
-        deleted_paths = self._cache.get_deleted_paths(current_files)
+        # Find stale and deleted paths against one snapshot of cached mtimes
+        stale_paths, deleted_paths = self._cache.get_changes(current_files)
 
         # Remove deleted entries
-        for path in deleted_paths:
-            self._cache.delete(path)
+        self._cache.delete_many(deleted_paths)
 
-        # Index stale files
-        for rel_path in stale_paths:
-            abs_path = self._base_dir / rel_path
-            try:
-                content = self._get_content(abs_path)
-                if content:
-                    vector = self._model.encode(content)
-                    mtime = current_files[rel_path]
-                    self._cache.set(rel_path, mtime, vector)
-            except Exception:
-                # Skip files that can't be processed
-                continue
+        # Index stale files in chunks so the model encodes each chunk at once.
+        # The next chunk is read on the I/O pool while the current one encodes.
+        chunks = [
+            stale_paths[start : start + INDEX_CHUNK_SIZE]
+            for start in range(0, len(stale_paths), INDEX_CHUNK_SIZE)
+        ]
+        pending = self._read_chunk(chunks[0], pool) if chunks else []
+        for i, chunk in enumerate(chunks):
+            contents = [future.result() for future in pending]
+            if i + 1 < len(chunks):
+                pending = self._read_chunk(chunks[i + 1], pool)
+            self._index_chunk(chunk, contents, current_files)
+
+    def _read_chunk(
+        self, rel_paths: list[str], pool: ThreadPoolExecutor
+    ) -> list[Future[str | None]]:
+        """Submit content reads for a chunk of files to the I/O pool.
+
+        Args:
+            rel_paths: Relative paths of the files to read.
+            pool: Executor to submit the reads to.
+
+        Returns:
+            Futures resolving to each file's content, in order.
+        """
+        return [
+            pool.submit(self._get_content, self._base_dir / rel_path)
+            for rel_path in rel_paths
+        ]
+
+    def _index_chunk(
+        self,
+        rel_paths: list[str],
+        contents: list[str | None],
+        current_files: dict[str, float],
+    ) -> None:
+        """Encode a chunk of files in one batch and store the results.
+
+        Args:
+            rel_paths: Relative paths of the files to index.
+            contents: Content of each file, None if unreadable.
+            current_files: Dictionary mapping path to current mtime.
+        """
+        paths: list[str] = []
+        texts: list[str] = []
+        for rel_path, content in zip(rel_paths, contents, strict=True):
+            if content:
+                paths.append(rel_path)
+                texts.append(content)
+
+        if not texts:
+            return
+
+        try:
+            vectors = list(self._model.encode_batch(texts))
+        except Exception:
+            # Encode one file at a time so only the files that fail are skipped
+            encoded_paths: list[str] = []
+            vectors = []
+            for rel_path, text in zip(paths, texts, strict=True):
+                try:
+                    vectors.append(self._model.encode(text))
+                except Exception:
+                    continue
+                encoded_paths.append(rel_path)
+            paths = encoded_paths
+
+        try:
+            self._cache.set_many(
+                [
+                    (rel_path, current_files[rel_path], vector)
+                    for rel_path, vector in zip(paths, vectors, strict=True)
+                ]
+            )
+        except Exception:
+            # Skip chunks that can't be stored; later chunks are still indexed
+            return
+
+    def _stat_file(self, file_path: Path) -> tuple[str, float] | None:
+        """Get relative path and mtime for a file.
+
+        Args:
+            file_path: Path to the file.
+
+        Returns:
+            Tuple of (relative path, mtime), or None if the file can't be stat'ed.
+        """
+        try:
+            rel_path = str(file_path.relative_to(self._base_dir))
+            return rel_path, file_path.stat().st_mtime
+        except (ValueError, OSError):
+            return None
 
     def _get_content(self, file_path: Path) -> str | None:
         """Get content from a file for embedding.
 
+        Only the body is needed, so the frontmatter block is split off with
+        python-frontmatter's own delimiters but never parsed.
+
         Args:
             file_path: Path to the file.
 
@@ -141,12 +229,20 @@ class EmbeddingIndexer:
             File content (body text after frontmatter), or None if empty.
         """
         try:
-            post = frontmatter.load(file_path)
-            content = post.content.strip()
-            return content if content else None
-        except Exception:
+            text = file_path.read_text(encoding="utf-8").strip()
+        except (OSError, UnicodeDecodeError):
             return None
 
+        content = text
+        handler = frontmatter.detect_format(text, frontmatter.handlers)
+        if handler is not None:
+            try:
+                _, content = handler.split(text)
+            except ValueError:
+                pass
+        content = content.strip()
+        return content if content else None
+
     def wait(self, timeout: float | None = None) -> bool:
         """Wait for indexing to complete.
 
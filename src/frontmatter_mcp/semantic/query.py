@@ -1,8 +1,7 @@
 """Semantic search query support module."""
 
-from typing import cast
-
 import duckdb
+import numpy as np
 import pyarrow as pa
 
 from frontmatter_mcp.semantic.context import SemanticContext
@@ -27,15 +26,39 @@ def add_semantic_columns(
     # Get dimension from model
     dim = ctx.model.get_dimension()
 
-    # Register embed() function
-    def embed_func(text: str) -> list[float]:
-        return cast(list[float], ctx.model.encode(text).tolist())
+    # Register embed() as a vectorized Arrow UDF: each call gets a batch of
+    # texts and returns one fixed-size list array, so vectors never pass
+    # through Python float lists. NULL texts map to NULL vectors.
+    def embed_func(texts: pa.Array | pa.ChunkedArray) -> pa.Array:
+        if isinstance(texts, pa.ChunkedArray):
+            texts = texts.combine_chunks()
+        values = texts.to_pylist()
+        unique = list(dict.fromkeys(text for text in values if text is not None))
+
+        # A single distinct text (e.g. embed('query')) uses the memoized
+        # encode(); distinct per-row texts are encoded in one batch
+        if len(unique) == 1:
+            vectors = {unique[0]: ctx.model.encode(unique[0])}
+        elif unique:
+            vectors = dict(zip(unique, ctx.model.encode_batch(unique), strict=True))
+        else:
+            vectors = {}
+
+        matrix = np.zeros((len(values), dim), dtype=np.float32)
+        for i, text in enumerate(values):
+            if text is not None:
+                matrix[i] = vectors[text]
+        return pa.FixedSizeListArray.from_arrays(
+            pa.array(matrix.ravel()), dim, mask=texts.is_null()
+        )
 
     conn.create_function(
         "embed",
         embed_func,
         [str],  # type: ignore[list-item]
         f"FLOAT[{dim}]",  # type: ignore[arg-type]
+        type="arrow",  # type: ignore[arg-type]
+        null_handling="special",  # type: ignore[arg-type]
     )
 
     # Add embedding column to files table
@@ -43,23 +66,27 @@ def add_semantic_columns(
 
     # Get embeddings from cache using read-only connection
     # This avoids lock conflicts when another process holds the write lock
-    embeddings = ctx.cache.get_all_readonly()
-    if embeddings:
-        paths = list(embeddings.keys())
-        vectors = [v.tolist() for v in embeddings.values()]
+    paths, matrix = ctx.cache.get_matrix_readonly()
+    if paths:
+        # Hand the contiguous matrix to DuckDB as a single fixed-size list
+        # column instead of boxing each float in Python
+        flat = matrix.astype(np.float32, copy=False).ravel()
+        vectors = pa.FixedSizeListArray.from_arrays(pa.array(flat), dim)
 
         arrow_table = pa.table({"path": paths, "vector": vectors})
-        conn.register("arrow_embeddings", arrow_table)
-        conn.execute(f"""
-            CREATE TEMP TABLE embeddings AS
-            SELECT path, vector::FLOAT[{dim}] as vector FROM arrow_embeddings
-        """)
-        conn.unregister("arrow_embeddings")
 
-        # Update files table with embeddings
-        conn.execute("""
-            UPDATE files
-            SET embedding = e.vector
-            FROM embeddings e
-            WHERE files.path = e.path
-        """)
+        # Update files table straight from the Arrow view; no intermediate
+        # copy of the embeddings is materialized. No HNSW index is built:
+        # the table lives for one query, building the index costs far more
+        # than the linear scan it would replace, and ORDER BY on a distance
+        # to embed('...') is not rewritten into an index scan anyway.
+        conn.register("arrow_embeddings", arrow_table)
+        try:
+            conn.execute(f"""
+                UPDATE files
+                SET embedding = e.vector::FLOAT[{dim}]
+                FROM arrow_embeddings e
+                WHERE files.path = e.path
+            """)
+        finally:
+            conn.unregister("arrow_embeddings")
@@ -1,24 +1,34 @@
 """MCP Server implementation using FastMCP."""
 
-import glob as globmodule
+import os
+import stat
+from collections.abc import Callable, Iterator
 from pathlib import Path
 from typing import Any
 
-import frontmatter
 from fastmcp import FastMCP
 from fastmcp.dependencies import Depends
 
 from frontmatter_mcp.dependencies import (
     get_file_record_cache,
+    get_files_table_cache,
+    get_post_cache,
     get_semantic_ctx,
     get_settings,
 )
 from frontmatter_mcp.files import (
     FileRecordCache,
+    PostCache,
+    glob_files,
     parse_files,
     update_file,
 )
-from frontmatter_mcp.query import create_base_connection, execute_query
+from frontmatter_mcp.query import (
+    FilesTableCache,
+    create_connection,
+    execute_query,
+    needs_private_database,
+)
 from frontmatter_mcp.query_schema import create_base_schema
 from frontmatter_mcp.semantic import SemanticContext, add_semantic_columns
 from frontmatter_mcp.semantic.query_schema import add_semantic_schema
@@ -31,9 +41,7 @@ mcp = FastMCP("frontmatter-mcp")
 
 def _collect_files(base_dir: Path, glob_pattern: str) -> list[Path]:
     """Collect files matching the glob pattern."""
-    pattern = str(base_dir / glob_pattern)
-    matches = globmodule.glob(pattern, recursive=True)
-    return [Path(p) for p in matches if Path(p).is_file()]
+    return glob_files(base_dir, glob_pattern)
 
 
 def _build_response(
@@ -84,6 +92,106 @@ def _resolve_path(base_dir: Path, rel_path: str) -> Path:
     return abs_path
 
 
+def _iter_batch_paths(
+    base_dir: Path, paths: list[Path], warnings: list[str]
+) -> Iterator[tuple[str, Path]]:
+    """Resolve collected paths for a batch tool, skipping invalid ones.
+
+    Equivalent to calling _resolve_path on each path, but each parent directory
+    is resolved once and files are checked with a single lstat. Only symlinked
+    or missing files go through the full per-file resolve.
+
+    Args:
+        base_dir: Base directory (already resolved).
+        paths: Paths returned by _collect_files.
+        warnings: List that receives a message for each skipped path.
+
+    Yields:
+        Tuples of (relative path, resolved absolute path).
+    """
+    # Containment and relative paths are plain string prefix operations, since
+    # both sides are already resolved
+    base_prefix = os.path.join(os.fspath(base_dir), "")
+    # Path objects are only built for yielded paths
+    parents: dict[str, str] = {}
+    for file_path in paths:
+        path_str = os.fspath(file_path)
+        if path_str.startswith(base_prefix):
+            rel_path = path_str[len(base_prefix) :]
+        else:
+            rel_path = str(file_path.relative_to(base_dir))
+        directory, name = os.path.split(path_str)
+        parent = parents.get(directory)
+        if parent is None:
+            parent = parents[directory] = os.path.realpath(directory)
+        abs_str = os.path.join(parent, name)
+        try:
+            is_regular = stat.S_ISREG(os.lstat(abs_str).st_mode)
+        except OSError:
+            is_regular = False
+
+        if is_regular and abs_str.startswith(base_prefix):
+            yield rel_path, Path(abs_str)
+            continue
+        try:
+            yield rel_path, _resolve_path(base_dir, rel_path)
+        except (ValueError, FileNotFoundError) as e:
+            warnings.append(str(e))
+
+
+def _batch_array_update(
+    base_dir: Path,
+    glob_pattern: str,
+    property: str,
+    update: Callable[[list[Any] | None], list[Any] | None],
+    post_cache: PostCache,
+) -> Response:
+    """Apply an array update to a property in every file matching glob.
+
+    Shared engine for the batch_array_* tools: path resolution, loading,
+    type checks, writes and warnings live here, and each tool only supplies
+    the update.
+
+    Args:
+        base_dir: Base directory (already resolved).
+        glob_pattern: Glob pattern relative to base_dir.
+        property: Name of the array property.
+        update: Receives the current array (None if the property doesn't
+            exist) and returns the new array, or None to leave the file as is.
+            It must not modify the array it receives.
+        post_cache: Cache to read posts from; written files drop their entry.
+
+    Returns:
+        Dict with updated_count, updated_files, and warnings.
+    """
+    paths = _collect_files(base_dir, glob_pattern)
+
+    updated_files: list[str] = []
+    warnings: list[str] = []
+
+    for rel_path, abs_path in _iter_batch_paths(base_dir, paths, warnings):
+        try:
+            post = post_cache.get(abs_path)
+            current = post.get(property)
+
+            # Property is not an array: skip with warning
+            if current is not None and not isinstance(current, list):
+                warnings.append(f"Skipped {rel_path}: '{property}' is not an array")
+                continue
+
+            new_values = update(current)
+            if new_values is None:
+                continue
+
+            post_cache.write_property(post, abs_path, property, new_values)
+            updated_files.append(rel_path)
+
+        except Exception as e:
+            warnings.append(f"Failed to update {rel_path}: {e}")
+
+    return _build_batch_response(updated_files, warnings)
+
+
 @mcp.tool()
 def query_inspect(
     glob: str,
@@ -124,6 +232,7 @@ def query(
     sql: str,
     settings: Settings = Depends(get_settings),
     cache: FileRecordCache = Depends(get_file_record_cache),
+    table_cache: FilesTableCache = Depends(get_files_table_cache),
     semantic_ctx: SemanticContext | None = Depends(get_semantic_ctx),
 ) -> Response:
     """Query frontmatter with DuckDB SQL.
@@ -151,13 +260,17 @@ def query(
     records, warnings = parse_files(paths, settings.base_dir, cache)
 
     # Create base connection with files table (path and frontmatter columns)
-    conn = create_base_connection(records)
-
-    # Add semantic search columns if enabled and ready
-    if semantic_ctx is not None and semantic_ctx.is_ready:
-        add_semantic_columns(conn, semantic_ctx)
+    conn = create_connection(
+        table_cache.get(glob, records), needs_private_database(sql)
+    )
+    try:
+        # Add semantic search columns if enabled and ready
+        if semantic_ctx is not None and semantic_ctx.is_ready:
+            add_semantic_columns(conn, semantic_ctx)
 
-    query_result = execute_query(conn, sql)
+        query_result = execute_query(conn, sql)
+    finally:
+        conn.close()
 
     return _build_response(
         {
@@ -250,7 +363,8 @@ def update(
         unset: Property names to remove completely.
 
     Returns:
-        Dict with path and updated frontmatter.
+        Dict with path, updated frontmatter, and skipped (True if nothing
+        changed and the file was not rewritten).
 
     Notes:
         - If same key appears in both set and unset, unset takes priority.
@@ -269,6 +383,7 @@ def batch_update(
     set: dict[str, Any] | None = None,
     unset: list[str] | None = None,
     settings: Settings = Depends(get_settings),
+    post_cache: PostCache = Depends(get_post_cache),
 ) -> Response:
     """Update frontmatter properties in multiple files matching glob pattern.
 
@@ -283,6 +398,7 @@ def batch_update(
     Notes:
         - If same key appears in both set and unset, unset takes priority.
         - If a file has no frontmatter, it will be created.
+        - Files are only included in updated_files if actually modified.
         - Errors in individual files are recorded in warnings, not raised.
     """
     base_dir = settings.base_dir
@@ -291,17 +407,11 @@ def batch_update(
     updated_files: list[str] = []
     warnings: list[str] = []
 
-    for file_path in paths:
-        rel_path = str(file_path.relative_to(base_dir))
+    for rel_path, abs_path in _iter_batch_paths(base_dir, paths, warnings):
         try:
-            abs_path = _resolve_path(base_dir, rel_path)
-        except (ValueError, FileNotFoundError) as e:
-            warnings.append(str(e))
-            continue
-
-        try:
-            result = update_file(abs_path, base_dir, set, unset)
-            updated_files.append(result["path"])
+            result = update_file(abs_path, base_dir, set, unset, post_cache)
+            if not result["skipped"]:
+                updated_files.append(result["path"])
         except Exception as e:
             warnings.append(f"Failed to update {rel_path}: {e}")
 
@@ -315,6 +425,7 @@ def batch_array_add(
     value: Any,
     allow_duplicates: bool = False,
     settings: Settings = Depends(get_settings),
+    post_cache: PostCache = Depends(get_post_cache),
 ) -> Response:
     """Add a value to an array property in multiple files.
 
@@ -332,49 +443,17 @@ def batch_array_add(
         - If property is not an array, file is skipped with a warning.
         - Files are only included in updated_files if actually modified.
     """
-    base_dir = settings.base_dir
-    paths = _collect_files(base_dir, glob)
 
-    updated_files: list[str] = []
-    warnings: list[str] = []
+    def add(current: list[Any] | None) -> list[Any] | None:
+        # Property doesn't exist: create new array
+        if current is None:
+            return [value]
+        # Check for duplicates
+        if not allow_duplicates and value in current:
+            return None
+        return [*current, value]
 
-    for file_path in paths:
-        rel_path = str(file_path.relative_to(base_dir))
-        try:
-            abs_path = _resolve_path(base_dir, rel_path)
-        except (ValueError, FileNotFoundError) as e:
-            warnings.append(str(e))
-            continue
-
-        try:
-            post = frontmatter.load(abs_path)
-            current = post.get(property)
-
-            # Property doesn't exist: create new array
-            if current is None:
-                post[property] = [value]
-                frontmatter.dump(post, abs_path)
-                updated_files.append(rel_path)
-                continue
-
-            # Property is not an array: skip with warning
-            if not isinstance(current, list):
-                warnings.append(f"Skipped {rel_path}: '{property}' is not an array")
-                continue
-
-            # Check for duplicates
-            if not allow_duplicates and value in current:
-                continue
-
-            # Add value
-            current.append(value)
-            frontmatter.dump(post, abs_path)
-            updated_files.append(rel_path)
-
-        except Exception as e:
-            warnings.append(f"Failed to update {rel_path}: {e}")
-
-    return _build_batch_response(updated_files, warnings)
+    return _batch_array_update(settings.base_dir, glob, property, add, post_cache)
 
 
 @mcp.tool()
@@ -383,6 +462,7 @@ def batch_array_remove(
     property: str,
     value: Any,
     settings: Settings = Depends(get_settings),
+    post_cache: PostCache = Depends(get_post_cache),
 ) -> Response:
     """Remove a value from an array property in multiple files.
 
@@ -400,46 +480,22 @@ def batch_array_remove(
         - If property is not an array, file is skipped with a warning.
         - Files are only included in updated_files if actually modified.
     """
-    base_dir = settings.base_dir
-    paths = _collect_files(base_dir, glob)
-
-    updated_files: list[str] = []
-    warnings: list[str] = []
-
-    for file_path in paths:
-        rel_path = str(file_path.relative_to(base_dir))
-        try:
-            abs_path = _resolve_path(base_dir, rel_path)
-        except (ValueError, FileNotFoundError) as e:
-            warnings.append(str(e))
-            continue
 
+    def remove(current: list[Any] | None) -> list[Any] | None:
+        # Property doesn't exist: skip
+        if current is None:
+            return None
+        # Value doesn't exist: skip (index() locates it in one scan)
         try:
-            post = frontmatter.load(abs_path)
-            current = post.get(property)
-
-            # Property doesn't exist: skip
-            if current is None:
-                continue
-
-            # Property is not an array: skip with warning
-            if not isinstance(current, list):
-                warnings.append(f"Skipped {rel_path}: '{property}' is not an array")
-                continue
-
-            # Value doesn't exist: skip
-            if value not in current:
-                continue
+            idx = current.index(value)
+        except ValueError:
+            return None
+        # Remove first occurrence
+        remaining = current.copy()
+        del remaining[idx]
+        return remaining
 
-            # Remove value
-            current.remove(value)
-            frontmatter.dump(post, abs_path)
-            updated_files.append(rel_path)
-
-        except Exception as e:
-            warnings.append(f"Failed to update {rel_path}: {e}")
-
-    return _build_batch_response(updated_files, warnings)
+    return _batch_array_update(settings.base_dir, glob, property, remove, post_cache)
 
 
 @mcp.tool()
@@ -449,6 +505,7 @@ def batch_array_replace(
     old_value: Any,
     new_value: Any,
     settings: Settings = Depends(get_settings),
+    post_cache: PostCache = Depends(get_post_cache),
 ) -> Response:
     """Replace a value in an array property in multiple files.
 
@@ -463,51 +520,33 @@ def batch_array_replace(
 
     Notes:
         - If property doesn't exist, file is skipped.
+        - Only the first occurrence of old_value is replaced.
         - If old_value doesn't exist in array, file is skipped.
+        - If new_value equals the value found, file is skipped.
         - If property is not an array, file is skipped with a warning.
         - Files are only included in updated_files if actually modified.
     """
-    base_dir = settings.base_dir
-    paths = _collect_files(base_dir, glob)
-
-    updated_files: list[str] = []
-    warnings: list[str] = []
-
-    for file_path in paths:
-        rel_path = str(file_path.relative_to(base_dir))
-        try:
-            abs_path = _resolve_path(base_dir, rel_path)
-        except (ValueError, FileNotFoundError) as e:
-            warnings.append(str(e))
-            continue
 
+    def replace(current: list[Any] | None) -> list[Any] | None:
+        # Property doesn't exist: skip
+        if current is None:
+            return None
+        # Old value doesn't exist: skip (index() locates it in one scan)
         try:
-            post = frontmatter.load(abs_path)
-            current = post.get(property)
-
-            # Property doesn't exist: skip
-            if current is None:
-                continue
-
-            # Property is not an array: skip with warning
-            if not isinstance(current, list):
-                warnings.append(f"Skipped {rel_path}: '{property}' is not an array")
-                continue
-
-            # Old value doesn't exist: skip
-            if old_value not in current:
-                continue
-
-            # Replace value
             idx = current.index(old_value)
-            current[idx] = new_value
-            frontmatter.dump(post, abs_path)
-            updated_files.append(rel_path)
+        except ValueError:
+            return None
+        # Replacing with an identical value: skip (1 == True, but they
+        # serialize differently)
+        found = current[idx]
+        if type(found) is type(new_value) and found == new_value:
+            return None
+        # Replace first occurrence
+        replaced = current.copy()
+        replaced[idx] = new_value
+        return replaced
 
-        except Exception as e:
-            warnings.append(f"Failed to update {rel_path}: {e}")
-
-    return _build_batch_response(updated_files, warnings)
+    return _batch_array_update(settings.base_dir, glob, property, replace, post_cache)
 
 
 @mcp.tool()
@@ -516,6 +555,7 @@ def batch_array_sort(
     property: str,
     reverse: bool = False,
     settings: Settings = Depends(get_settings),
+    post_cache: PostCache = Depends(get_post_cache),
 ) -> Response:
     """Sort an array property in multiple files.
 
@@ -534,58 +574,18 @@ def batch_array_sort(
         - If property is not an array, file is skipped with a warning.
         - Files are only included in updated_files if actually modified.
     """
-    base_dir = settings.base_dir
-    paths = _collect_files(base_dir, glob)
 
-    updated_files: list[str] = []
-    warnings: list[str] = []
+    def sort(current: list[Any] | None) -> list[Any] | None:
+        # Property doesn't exist, or empty array or single element: skip
+        if current is None or len(current) <= 1:
+            return None
+        # Already sorted: skip (sorted() is stable, so equal means no-op)
+        sorted_values = sorted(current, reverse=reverse)
+        if sorted_values == current:
+            return None
+        return sorted_values
 
-    for file_path in paths:
-        rel_path = str(file_path.relative_to(base_dir))
-        try:
-            abs_path = _resolve_path(base_dir, rel_path)
-        except (ValueError, FileNotFoundError) as e:
-            warnings.append(str(e))
-            continue
-
-        try:
-            post = frontmatter.load(abs_path)
-            current = post.get(property)
-
-            # Property doesn't exist: skip
-            if current is None:
-                continue
-
-            # Property is not an array: skip with warning
-            if not isinstance(current, list):
-                warnings.append(f"Skipped {rel_path}: '{property}' is not an array")
-                continue
-
-            # Empty array or single element: skip (already sorted)
-            if len(current) <= 1:
-                continue
-
-            # Check if already sorted using pairwise comparison
-            if not reverse:
-                is_sorted = all(
-                    current[i] <= current[i + 1] for i in range(len(current) - 1)
-                )
-            else:
-                is_sorted = all(
-                    current[i] >= current[i + 1] for i in range(len(current) - 1)
-                )
-            if is_sorted:
-                continue
-
-            # Sort
-            post[property] = sorted(current, reverse=reverse)
-            frontmatter.dump(post, abs_path)
-            updated_files.append(rel_path)
-
-        except Exception as e:
-            warnings.append(f"Failed to update {rel_path}: {e}")
-
-    return _build_batch_response(updated_files, warnings)
+    return _batch_array_update(settings.base_dir, glob, property, sort, post_cache)
 
 
 @mcp.tool()
@@ -593,6 +593,7 @@ def batch_array_unique(
     glob: str,
     property: str,
     settings: Settings = Depends(get_settings),
+    post_cache: PostCache = Depends(get_post_cache),
 ) -> Response:
     """Remove duplicate values from an array property in multiple files.
 
@@ -611,53 +612,19 @@ def batch_array_unique(
         - If property is not an array, file is skipped with a warning.
         - Files are only included in updated_files if actually modified.
     """
-    base_dir = settings.base_dir
-    paths = _collect_files(base_dir, glob)
-
-    updated_files: list[str] = []
-    warnings: list[str] = []
 
-    for file_path in paths:
-        rel_path = str(file_path.relative_to(base_dir))
-        try:
-            abs_path = _resolve_path(base_dir, rel_path)
-        except (ValueError, FileNotFoundError) as e:
-            warnings.append(str(e))
-            continue
-
-        try:
-            post = frontmatter.load(abs_path)
-            current = post.get(property)
-
-            # Property doesn't exist: skip
-            if current is None:
-                continue
-
-            # Property is not an array: skip with warning
-            if not isinstance(current, list):
-                warnings.append(f"Skipped {rel_path}: '{property}' is not an array")
-                continue
-
-            # Empty array or single element: skip (no duplicates possible)
-            if len(current) <= 1:
-                continue
-
-            # Remove duplicates while preserving order
-            unique = list(dict.fromkeys(current))
-
-            # No duplicates: skip
-            if len(unique) == len(current):
-                continue
-
-            # Update
-            post[property] = unique
-            frontmatter.dump(post, abs_path)
-            updated_files.append(rel_path)
-
-        except Exception as e:
-            warnings.append(f"Failed to update {rel_path}: {e}")
-
-    return _build_batch_response(updated_files, warnings)
+    def unique(current: list[Any] | None) -> list[Any] | None:
+        # Property doesn't exist, or empty array or single element: skip
+        if current is None or len(current) <= 1:
+            return None
+        # Remove duplicates while preserving order
+        unique_values = list(dict.fromkeys(current))
+        # No duplicates: skip
+        if len(unique_values) == len(current):
+            return None
+        return unique_values
+
+    return _batch_array_update(settings.base_dir, glob, property, unique, post_cache)
 
 
 def main() -> None:
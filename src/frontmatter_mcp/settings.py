@@ -1,7 +1,8 @@
 """Application settings loaded from environment variables."""
 
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from pathlib import Path
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -18,11 +19,17 @@ class Settings(BaseSettings):
     frontmatter_enable_semantic: bool = False
     frontmatter_embedding_model: str = DEFAULT_EMBEDDING_MODEL
     frontmatter_cache_dir: Path | None = None
+    frontmatter_embedding_storage: Literal["float32", "int8"] = "float32"
+
+    @cached_property
+    def _resolved_base_dir(self) -> Path:
+        """Base directory with symlinks resolved (one realpath per instance)."""
+        return self.frontmatter_base_dir.resolve()
 
     @property
     def base_dir(self) -> Path:
         """Base directory for markdown files."""
-        base_dir = self.frontmatter_base_dir.resolve()
+        base_dir = self._resolved_base_dir
         if not base_dir.is_dir():
             raise RuntimeError(f"Base directory does not exist: {base_dir}")
         return base_dir
@@ -37,6 +44,11 @@ class Settings(BaseSettings):
         """Embedding model name for semantic search."""
         return self.frontmatter_embedding_model
 
+    @property
+    def embedding_storage(self) -> Literal["float32", "int8"]:
+        """On-disk encoding of cached embedding vectors."""
+        return self.frontmatter_embedding_storage
+
     @property
     def cache_dir(self) -> Path:
         """Cache directory for embeddings database."""
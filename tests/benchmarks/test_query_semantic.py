@@ -19,14 +19,14 @@ FILE_COUNTS = [100, 500]
 
 def _create_mock_semantic_context(paths: list[str], dim: int = 256) -> SemanticContext:
     """Create a mock SemanticContext with random embeddings."""
-    embeddings = {path: np.random.rand(dim).astype(np.float32) for path in paths}
+    matrix = np.random.rand(len(paths), dim).astype(np.float32)
 
     mock_model = MagicMock()
     mock_model.get_dimension.return_value = dim
     mock_model.encode.return_value = np.random.rand(dim).astype(np.float32)
 
     mock_cache = MagicMock()
-    mock_cache.get_all_readonly.return_value = embeddings
+    mock_cache.get_matrix_readonly.return_value = (paths, matrix)
 
     mock_indexer = MagicMock()
 
@@ -168,6 +168,45 @@ class TestEmbeddingCache:
         deleted = cache.get_deleted_paths(current_files)
         assert deleted == ["deleted.md"]
 
+    def test_set_many(self, cache: EmbeddingCache) -> None:
+        """Store several embeddings at once."""
+        vectors = np.random.rand(3, 256).astype(np.float32)
+        cache.set_many(
+            [(f"{i}.md", 1000.0 + i, vector) for i, vector in enumerate(vectors)]
+        )
+        cache.set_many([])
+
+        assert cache.get_all_paths_with_mtime() == {
+            "0.md": 1000.0,
+            "1.md": 1001.0,
+            "2.md": 1002.0,
+        }
+        result = cache.get("2.md")
+        assert result is not None
+        np.testing.assert_array_almost_equal(result[1], vectors[2], decimal=5)
+
+    def test_get_changes(self, cache: EmbeddingCache) -> None:
+        """Detect stale and deleted paths together."""
+        vector = np.random.rand(256).astype(np.float32)
+        cache.set("same.md", 1000.0, vector)
+        cache.set("modified.md", 1000.0, vector)
+        cache.set("deleted.md", 1000.0, vector)
+
+        current_files = {"same.md": 1000.0, "modified.md": 2000.0, "new.md": 1.0}
+        stale, deleted = cache.get_changes(current_files)
+        assert sorted(stale) == ["modified.md", "new.md"]
+        assert deleted == ["deleted.md"]
+
+    def test_delete_many(self, cache: EmbeddingCache) -> None:
+        """Delete several paths at once."""
+        vector = np.random.rand(256).astype(np.float32)
+        for name in ("a.md", "b.md", "c.md"):
+            cache.set(name, 1000.0, vector)
+
+        cache.delete_many(["a.md", "c.md"])
+        cache.delete_many([])
+        assert cache.get_all_paths_with_mtime() == {"b.md": 1000.0}
+
     def test_get_all(self, cache: EmbeddingCache) -> None:
         """Get all embeddings as dict."""
         vector_a = np.random.rand(256).astype(np.float32)
@@ -193,6 +232,38 @@ class TestEmbeddingCache:
         np.testing.assert_array_almost_equal(result["a.md"], vector_a, decimal=5)
         np.testing.assert_array_almost_equal(result["b.md"], vector_b, decimal=5)
 
+    def test_get_matrix_readonly(self, cache: EmbeddingCache) -> None:
+        """Get all embeddings as a contiguous float32 matrix."""
+        vector_a = np.random.rand(256).astype(np.float32)
+        vector_b = np.random.rand(256).astype(np.float32)
+        cache.set("a.md", 1000.0, vector_a)
+        cache.set("b.md", 2000.0, vector_b)
+        cache.close()  # Close write connection
+
+        paths, matrix = cache.get_matrix_readonly()
+        assert matrix.shape == (2, 256)
+        assert matrix.dtype == np.float32
+        assert matrix.flags.c_contiguous
+        rows = dict(zip(paths, matrix, strict=True))
+        np.testing.assert_array_almost_equal(rows["a.md"], vector_a, decimal=5)
+        np.testing.assert_array_almost_equal(rows["b.md"], vector_b, decimal=5)
+
+    def test_get_matrix_readonly_memoized_until_db_changes(
+        self, cache: EmbeddingCache
+    ) -> None:
+        """Snapshot is reused until the database file changes."""
+        cache.set("a.md", 1000.0, np.random.rand(256).astype(np.float32))
+        cache.close()
+
+        first = cache.get_matrix_readonly()
+        assert cache.get_matrix_readonly() is first
+
+        cache.set("b.md", 1000.0, np.random.rand(256).astype(np.float32))
+        cache.close()
+
+        paths, _ = cache.get_matrix_readonly()
+        assert sorted(paths) == ["a.md", "b.md"]
+
     def test_get_all_readonly_returns_empty_when_db_not_exists(
         self, cache_dir: Path
     ) -> None:
@@ -261,3 +332,57 @@ class TestEmbeddingCacheModelChange:
         cache2 = EmbeddingCache(cache_dir, model=mock_model2)
         assert cache2.count() == 1  # Cache should be preserved
         cache2.close()
+
+
+class TestEmbeddingCacheInt8Storage:
+    """Tests for int8 quantized storage."""
+
+    @pytest.fixture
+    def cache_dir(self, tmp_path: Path) -> Path:
+        """Create a temporary cache directory."""
+        return tmp_path / ".frontmatter-mcp"
+
+    def test_roundtrip_is_close(self, cache_dir: Path) -> None:
+        """Quantized vectors dequantize close to the original."""
+        cache = EmbeddingCache(
+            cache_dir, model=create_mock_model(), storage_dtype="int8"
+        )
+        vector = np.random.rand(256).astype(np.float32) - 0.5
+        cache.set("a.md", 1000.0, vector)
+
+        result = cache.get("a.md")
+        assert result is not None
+        assert result[1].dtype == np.float32
+        np.testing.assert_allclose(result[1], vector, atol=0.5 / 127)
+        cache.close()
+
+        paths, matrix = cache.get_matrix_readonly()
+        assert paths == ["a.md"]
+        np.testing.assert_allclose(matrix[0], vector, atol=0.5 / 127)
+
+    def test_set_many_matches_set(self, cache_dir: Path) -> None:
+        """Batch inserts quantize the same way as single inserts."""
+        cache = EmbeddingCache(
+            cache_dir, model=create_mock_model(), storage_dtype="int8"
+        )
+        vectors = np.random.rand(2, 256).astype(np.float32) - 0.5
+        cache.set("single.md", 1000.0, vectors[0])
+        cache.set_many([("batch.md", 1000.0, vectors[0]), ("b.md", 1.0, vectors[1])])
+
+        single = cache.get("single.md")
+        batch = cache.get("batch.md")
+        assert single is not None and batch is not None
+        np.testing.assert_array_almost_equal(single[1], batch[1], decimal=6)
+        cache.close()
+
+    def test_storage_dtype_change_clears_cache(self, cache_dir: Path) -> None:
+        """Switching storage dtype drops vectors stored in the old encoding."""
+        cache1 = EmbeddingCache(cache_dir, model=create_mock_model())
+        cache1.set("a.md", 1000.0, np.random.rand(256).astype(np.float32))
+        cache1.close()
+
+        cache2 = EmbeddingCache(
+            cache_dir, model=create_mock_model(), storage_dtype="int8"
+        )
+        assert cache2.count() == 0
+        cache2.close()
@@ -1,5 +1,6 @@
 """Tests for semantic indexer module."""
 
+import threading
 import time
 from pathlib import Path
 from typing import Generator
@@ -9,6 +10,7 @@ import numpy as np
 import pytest
 
 from frontmatter_mcp.semantic import EmbeddingCache, EmbeddingIndexer, IndexerState
+from frontmatter_mcp.semantic.indexer import INDEX_CHUNK_SIZE
 
 
 class TestEmbeddingIndexer:
@@ -32,9 +34,16 @@ class TestEmbeddingIndexer:
         model = MagicMock()
         model.name = "test-model"
         model.encode.return_value = np.random.rand(256).astype(np.float32)
+        model.encode_batch.side_effect = lambda texts: np.random.rand(
+            len(texts), 256
+        ).astype(np.float32)
         model.get_dimension.return_value = 256
         return model
 
+    def _encoded_count(self, mock_model: MagicMock) -> int:
+        """Count texts passed to encode_batch across all calls."""
+        return sum(len(c.args[0]) for c in mock_model.encode_batch.call_args_list)
+
     @pytest.fixture
     def cache(
         self, cache_dir: Path, mock_model: MagicMock
@@ -88,11 +97,11 @@ class TestEmbeddingIndexer:
         self._create_md_file(base_dir, "a.md", "Content A")
 
         # Make encode slow to keep indexing state
-        def slow_encode(text):
+        def slow_encode_batch(texts):
             time.sleep(0.5)
-            return np.random.rand(256).astype(np.float32)
+            return np.random.rand(len(texts), 256).astype(np.float32)
 
-        mock_model.encode.side_effect = slow_encode
+        mock_model.encode_batch.side_effect = slow_encode_batch
 
         files = list(base_dir.glob("*.md"))
         indexer = EmbeddingIndexer(cache, mock_model, lambda: files, base_dir)
@@ -121,9 +130,9 @@ class TestEmbeddingIndexer:
         # First indexing
         indexer.start()
         indexer.wait(timeout=5.0)
-        assert mock_model.encode.call_count == 2
+        assert self._encoded_count(mock_model) == 2
 
-        mock_model.encode.reset_mock()
+        mock_model.encode_batch.reset_mock()
 
         # Modify one file
         time.sleep(0.01)  # Ensure mtime changes
@@ -134,7 +143,7 @@ class TestEmbeddingIndexer:
         indexer.wait(timeout=5.0)
 
         # Only modified file should be re-indexed
-        assert mock_model.encode.call_count == 1
+        assert self._encoded_count(mock_model) == 1
 
     def test_deleted_file_removed_from_cache(
         self, cache: EmbeddingCache, mock_model: MagicMock, base_dir: Path
@@ -178,6 +187,22 @@ class TestEmbeddingIndexer:
         # Only file with content should be indexed
         assert cache.count() == 1
 
+    def test_only_body_is_encoded(
+        self, cache: EmbeddingCache, mock_model: MagicMock, base_dir: Path
+    ) -> None:
+        """Frontmatter is stripped before encoding; plain files are kept whole."""
+        self._create_md_file(base_dir, "a.md", "Body text\n")
+        (base_dir / "plain.md").write_text("No frontmatter here")
+
+        files = sorted(base_dir.glob("*.md"))
+        indexer = EmbeddingIndexer(cache, mock_model, lambda: files, base_dir)
+
+        indexer.start()
+        indexer.wait(timeout=5.0)
+
+        texts = mock_model.encode_batch.call_args.args[0]
+        assert sorted(texts) == ["Body text", "No frontmatter here"]
+
     def test_wait_returns_true_on_completion(
         self, cache: EmbeddingCache, mock_model: MagicMock, base_dir: Path
     ) -> None:
@@ -237,3 +262,82 @@ class TestEmbeddingIndexer:
         assert indexer.state == IndexerState.READY
         # Connection should be closed after indexing
         assert cache._conn is None
+
+    def test_io_pool_shut_down_after_indexing(
+        self, cache: EmbeddingCache, mock_model: MagicMock, base_dir: Path
+    ) -> None:
+        """I/O worker threads do not outlive an indexing run."""
+        self._create_md_file(base_dir, "a.md", "Content A")
+
+        files = list(base_dir.glob("*.md"))
+        indexer = EmbeddingIndexer(cache, mock_model, lambda: files, base_dir)
+
+        indexer.start()
+        indexer.wait(timeout=5.0)
+
+        assert not [t for t in threading.enumerate() if t.name.startswith("indexer-io")]
+
+    def test_stale_files_encoded_in_batches(
+        self, cache: EmbeddingCache, mock_model: MagicMock, base_dir: Path
+    ) -> None:
+        """Stale files are encoded in chunks rather than one call per file."""
+        for i in range(INDEX_CHUNK_SIZE + 1):
+            self._create_md_file(base_dir, f"{i}.md", f"Content {i}")
+
+        files = list(base_dir.glob("*.md"))
+        indexer = EmbeddingIndexer(cache, mock_model, lambda: files, base_dir)
+
+        indexer.start()
+        indexer.wait(timeout=5.0)
+
+        assert mock_model.encode_batch.call_count == 2
+        assert mock_model.encode.call_count == 0
+        assert cache.count() == INDEX_CHUNK_SIZE + 1
+
+    def test_failed_batch_skips_only_bad_files(
+        self, cache: EmbeddingCache, mock_model: MagicMock, base_dir: Path
+    ) -> None:
+        """A failing batch falls back to per-file encoding."""
+        self._create_md_file(base_dir, "good.md", "Good")
+        self._create_md_file(base_dir, "bad.md", "Bad")
+        mock_model.encode_batch.side_effect = RuntimeError("batch failed")
+
+        def encode(text: str) -> np.ndarray:
+            if text == "Bad":
+                raise RuntimeError("encode failed")
+            return np.random.rand(256).astype(np.float32)
+
+        mock_model.encode.side_effect = encode
+
+        files = list(base_dir.glob("*.md"))
+        indexer = EmbeddingIndexer(cache, mock_model, lambda: files, base_dir)
+        indexer.start()
+        indexer.wait(timeout=5.0)
+
+        assert indexer.state == IndexerState.READY
+        assert cache.get_all_readonly().keys() == {"good.md"}
+
+    def test_failed_cache_write_skips_only_that_chunk(
+        self, cache: EmbeddingCache, mock_model: MagicMock, base_dir: Path
+    ) -> None:
+        """A chunk that can't be stored does not stop later chunks."""
+        for i in range(INDEX_CHUNK_SIZE + 1):
+            self._create_md_file(base_dir, f"{i}.md", f"Content {i}")
+        original_set_many = cache.set_many
+        calls = []
+
+        def set_many(items: list) -> None:
+            calls.append(items)
+            if len(calls) == 1:
+                raise RuntimeError("write failed")
+            original_set_many(items)
+
+        cache.set_many = set_many  # type: ignore[method-assign]
+
+        files = list(base_dir.glob("*.md"))
+        indexer = EmbeddingIndexer(cache, mock_model, lambda: files, base_dir)
+        indexer.start()
+        indexer.wait(timeout=5.0)
+
+        assert len(calls) == 2
+        assert cache.count() == 1
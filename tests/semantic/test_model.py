@@ -1,5 +1,8 @@
 """Tests for semantic model module."""
 
+from unittest.mock import MagicMock, patch
+
+import numpy as np
 import pytest
 
 from frontmatter_mcp.semantic.model import EmbeddingModel
@@ -19,6 +22,39 @@ class TestEmbeddingModel:
         model = EmbeddingModel(DEFAULT_EMBEDDING_MODEL)
         assert not model.is_loaded
 
+    def test_encode_is_memoized(self) -> None:
+        """Encoding the same text twice runs the model once."""
+        model = EmbeddingModel("custom-model")
+        model._model = MagicMock()
+        model._model.encode.return_value = np.random.rand(256).astype(np.float32)
+
+        first = model.encode("query")
+        second = model.encode("query")
+        model.encode("other query")
+
+        assert first is second
+        assert model._model.encode.call_count == 2
+
+    def test_dimension_is_cached(self) -> None:
+        """The model is asked for its dimension only once."""
+        model = EmbeddingModel("custom-model")
+        model._model = MagicMock()
+        model._model.get_sentence_embedding_dimension.return_value = 256
+
+        assert model.get_dimension() == 256
+        assert model.get_dimension() == 256
+        model._model.get_sentence_embedding_dimension.assert_called_once()
+
+    @pytest.mark.parametrize(("device", "halved"), [("cuda", True), ("cpu", False)])
+    def test_half_precision_on_cuda(self, device: str, halved: bool) -> None:
+        """Weights are cast to float16 only on CUDA devices."""
+        with patch("frontmatter_mcp.semantic.model.SentenceTransformer") as mock_cls:
+            mock_cls.return_value.device.type = device
+            model = EmbeddingModel("custom-model")
+            _ = model.model
+
+        assert mock_cls.return_value.half.called is halved
+
 
 @pytest.mark.slow
 class TestEmbeddingModelWithRealModel:
@@ -53,6 +89,15 @@ class TestEmbeddingModelWithRealModel:
         assert embedding.shape == (dim,)
         assert embedding.dtype.kind == "f"  # float type
 
+    def test_encode_batch(self) -> None:
+        """Encode multiple texts to a matrix in one call."""
+        model = EmbeddingModel(DEFAULT_EMBEDDING_MODEL)
+        dim = model.get_dimension()
+        embeddings = model.encode_batch(["テスト文章", "別の文章"])
+
+        assert embeddings.shape == (2, dim)
+        assert embeddings.dtype.kind == "f"  # float type
+
     def test_similar_texts_have_similar_embeddings(self) -> None:
         """Similar texts produce similar embeddings."""
         model = EmbeddingModel(DEFAULT_EMBEDDING_MODEL)
@@ -69,7 +114,7 @@ class TestEmbeddingModelWithRealModel:
 
         # Cosine similarity
         def cosine_sim(a, b):
-            return (a @ b) / (sum(a**2) ** 0.5 * sum(b**2) ** 0.5)
+            return float(a @ b) / (np.linalg.norm(a) * np.linalg.norm(b))
 
         sim_12 = cosine_sim(emb1, emb2)
         sim_13 = cosine_sim(emb1, emb3)
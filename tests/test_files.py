@@ -1,12 +1,23 @@
 """Tests for frontmatter module."""
 
+import glob
+import os
+import time
 from datetime import date
 from pathlib import Path
+from typing import Any
+
+import frontmatter
+import pytest
 
 from frontmatter_mcp.files import (
+    DirectoryListingCache,
     FileRecordCache,
+    PostCache,
+    glob_files,
     parse_file,
     parse_files,
+    scan_files,
     update_file,
 )
 
@@ -54,6 +65,27 @@ title: Nested
 
         assert result["path"] == "atoms/sub/nested.md"
 
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "---\ntitle: Head\n---\n# Body\n\n---\n\nmore: text\n",
+            "\n\n---\ntitle: Head\n---\nBody",
+            "---\r\ntitle: Head\r\n---\r\nBody\r\n",
+            "---\ntitle: Unclosed\n",
+            "+++\ntitle = 'toml'\n+++\n",
+            "# No frontmatter\n\n---\ntitle: Late\n---\n",
+            "  ---\ntitle: Indented\n---\n",
+        ],
+    )
+    def test_parse_file_matches_full_load(self, tmp_path: Path, text: str) -> None:
+        """Reading only the head gives the same metadata as frontmatter.load."""
+        md_file = tmp_path / "test.md"
+        md_file.write_bytes(text.encode())
+
+        result = parse_file(md_file, tmp_path)
+
+        assert result == {"path": "test.md", **frontmatter.load(md_file).metadata}
+
 
 class TestUpdateFile:
     """Tests for update_file function."""
@@ -201,6 +233,70 @@ Some paragraph.
         assert "Some paragraph." in content
         assert "- List item" in content
 
+    def test_noop_update_skips_write(self, tmp_path: Path) -> None:
+        """Update that changes nothing leaves the file untouched."""
+        md_file = tmp_path / "test.md"
+        original = "---\ntitle: Test\nstatus: done\n---\n\n\n# Content\n"
+        md_file.write_text(original)
+
+        result = update_file(md_file, tmp_path, {"status": "done"}, ["missing"])
+
+        assert result["skipped"] is True
+        assert md_file.read_text() == original
+
+    def test_type_change_is_written(self, tmp_path: Path) -> None:
+        """Equal values of a different type still count as a change."""
+        md_file = tmp_path / "test.md"
+        md_file.write_text("---\nflag: 1\n---\n")
+
+        result = update_file(md_file, tmp_path, {"flag": True})
+
+        assert result["skipped"] is False
+        assert "flag: true" in md_file.read_text()
+
+    def test_update_through_post_cache(self, tmp_path: Path) -> None:
+        """Update via PostCache writes the file without mutating the cached post."""
+        md_file = tmp_path / "test.md"
+        md_file.write_text("---\ntitle: Test\ndraft: true\n---\nBody")
+        cache = PostCache()
+        original = cache.get(md_file)
+
+        result = update_file(md_file, tmp_path, {"status": "done"}, ["draft"], cache)
+
+        assert result["frontmatter"] == {"title": "Test", "status": "done"}
+        assert original.metadata == {"title": "Test", "draft": True}
+        assert cache.get(md_file).metadata == frontmatter.load(md_file).metadata
+
+    def test_write_replaces_file_atomically(self, tmp_path: Path) -> None:
+        """Write keeps the file mode and leaves no temporary files."""
+        md_file = tmp_path / "test.md"
+        md_file.write_text("---\ntitle: Test\n---\n")
+        md_file.chmod(0o640)
+
+        update_file(md_file, tmp_path, {"status": "done"})
+
+        assert md_file.stat().st_mode & 0o777 == 0o640
+        assert [p.name for p in tmp_path.iterdir()] == ["test.md"]
+
+    def test_failed_write_keeps_original(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Error while serializing leaves the original file untouched."""
+        md_file = tmp_path / "test.md"
+        original = "---\ntitle: Test\n---\n"
+        md_file.write_text(original)
+
+        def failing_dump(post: frontmatter.Post, fd: Any) -> None:
+            fd.write(b"---\npartial")
+            raise OSError("disk full")
+
+        monkeypatch.setattr(frontmatter, "dump", failing_dump)
+        with pytest.raises(OSError):
+            update_file(md_file, tmp_path, {"status": "done"})
+
+        assert md_file.read_text() == original
+        assert [p.name for p in tmp_path.iterdir()] == ["test.md"]
+
 
 class TestFrontmatterCache:
     """Tests for FrontmatterCache class."""
@@ -245,6 +341,19 @@ title: Modified
         cached = cache.get(md_file, tmp_path)
         assert cached is None
 
+    def test_cache_miss_on_size_change_with_same_mtime(self, tmp_path: Path) -> None:
+        """Cache returns None when size changes even if mtime is restored."""
+        md_file = tmp_path / "test.md"
+        md_file.write_text("---\ntitle: Original\n---\n")
+        cache = FileRecordCache()
+        cache.set(md_file, tmp_path, parse_file(md_file, tmp_path))
+        st = md_file.stat()
+
+        md_file.write_text("---\ntitle: Modified text\n---\n")
+        os.utime(md_file, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+        assert cache.get(md_file, tmp_path) is None
+
     def test_cache_miss_on_new_file(self, tmp_path: Path) -> None:
         """Cache returns None for uncached file."""
         md_file = tmp_path / "test.md"
@@ -292,6 +401,98 @@ title: Test
         assert cache.get(file2, tmp_path) is None
 
 
+def _make_old(path: Path) -> None:
+    """Move a file's mtime out of the racy window."""
+    old = time.time_ns() - 3600 * 1_000_000_000
+    os.utime(path, ns=(old, old))
+
+
+class TestPostCache:
+    """Tests for PostCache class."""
+
+    def test_load_reuses_parse(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Unchanged file is parsed only once."""
+        md_file = tmp_path / "test.md"
+        md_file.write_text("---\ntags: [a]\n---\nBody")
+        _make_old(md_file)
+        calls = []
+        original_loads = frontmatter.loads
+        monkeypatch.setattr(
+            frontmatter, "loads", lambda t: calls.append(t) or original_loads(t)
+        )
+        cache = PostCache()
+
+        first = cache.get(md_file)
+        second = cache.get(md_file)
+
+        assert len(calls) == 1
+        assert second is first
+        assert second.content == "Body"
+
+    def test_racy_mtime_not_trusted(self, tmp_path: Path) -> None:
+        """Same-size edit within the mtime tick is not served from cache."""
+        md_file = tmp_path / "test.md"
+        md_file.write_text("---\ntitle: AAA\n---\n")
+        st = md_file.stat()
+        cache = PostCache()
+        cache.get(md_file)
+
+        md_file.write_text("---\ntitle: BBB\n---\n")
+        os.utime(md_file, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+        assert cache.get(md_file)["title"] == "BBB"
+
+    def test_write_property_drops_entry(self, tmp_path: Path) -> None:
+        """Written post matches the file on disk on the next get."""
+        md_file = tmp_path / "test.md"
+        md_file.write_text("---\ntags: [a]\ntitle: T\n---\nBody")
+        _make_old(md_file)
+        cache = PostCache()
+
+        post = cache.get(md_file)
+        cache.write_property(post, md_file, "tags", ["a", "b"])
+
+        assert post["tags"] == ["a"]
+        reloaded = cache.get(md_file)
+        assert reloaded is not post
+        assert reloaded.metadata == {"tags": ["a", "b"], "title": "T"}
+        assert reloaded.metadata == frontmatter.load(md_file).metadata
+        assert reloaded.content == "Body"
+
+    def test_external_change_reloads(self, tmp_path: Path) -> None:
+        """File changed outside the cache is parsed again."""
+        md_file = tmp_path / "test.md"
+        md_file.write_text("---\ntitle: Original\n---\n")
+        _make_old(md_file)
+        cache = PostCache()
+        cache.get(md_file)
+
+        md_file.write_text("---\ntitle: Modified title\n---\n")
+
+        assert cache.get(md_file)["title"] == "Modified title"
+
+    def test_evicts_least_recently_used(self, tmp_path: Path) -> None:
+        """Entries beyond maxsize evict the least recently used post."""
+        files = []
+        for name in ("a", "b", "c"):
+            md_file = tmp_path / f"{name}.md"
+            md_file.write_text(f"---\ntitle: {name}\n---\n")
+            _make_old(md_file)
+            files.append(md_file)
+        cache = PostCache(maxsize=2)
+
+        a = cache.get(files[0])
+        cache.get(files[1])
+        assert cache.get(files[0]) is a
+        cache.get(files[2])
+
+        assert cache.get(files[0]) is a
+        assert len(cache._cache) == 2
+        assert files[1] not in cache._cache
+
+
 class TestParseFilesCached:
     """Tests for parse_files_cached function."""
 
@@ -324,11 +525,8 @@ class TestParseFilesCached:
         assert records1[0]["title"] == "Original"
 
         # Modify cache entry directly to verify it's being used
-        from frontmatter_mcp.files import FileRecordCacheEntry
-
-        cache._cache["test.md"] = FileRecordCacheEntry(
-            cache._cache["test.md"].mtime,
-            {"path": "test.md", "title": "Cached"},
+        cache._cache["test.md"] = cache._cache["test.md"]._replace(
+            record={"path": "test.md", "title": "Cached"}
         )
 
         # Second call should use cache
@@ -358,3 +556,101 @@ class TestParseFilesCached:
         assert len(records) == 1
         assert len(warnings) == 1
         assert warnings[0]["path"] == "invalid.md"
+
+
+class TestScanFiles:
+    """Tests for scan_files function."""
+
+    def test_finds_nested_files(self, tmp_path: Path) -> None:
+        """Files in subdirectories are found recursively."""
+        (tmp_path / "a.md").write_text("a")
+        (tmp_path / "sub" / "deep").mkdir(parents=True)
+        (tmp_path / "sub" / "b.md").write_text("b")
+        (tmp_path / "sub" / "deep" / "c.md").write_text("c")
+
+        result = scan_files(tmp_path)
+
+        assert sorted(p.relative_to(tmp_path).as_posix() for p in result) == [
+            "a.md",
+            "sub/b.md",
+            "sub/deep/c.md",
+        ]
+
+    def test_ignores_other_suffixes_and_directories(self, tmp_path: Path) -> None:
+        """Only regular files with the suffix are returned."""
+        (tmp_path / "a.md").write_text("a")
+        (tmp_path / "b.txt").write_text("b")
+        (tmp_path / "dir.md").mkdir()
+
+        result = scan_files(tmp_path)
+
+        assert result == [tmp_path / "a.md"]
+
+
+class TestGlobFiles:
+    """Tests for glob_files function."""
+
+    @pytest.fixture
+    def tree(self, tmp_path: Path) -> Path:
+        """Create a directory tree with nested, hidden and non-md entries."""
+        for rel in [
+            "a.md",
+            "b.txt",
+            ".hidden.md",
+            "atoms/x.md",
+            "atoms/2025-01.md",
+            "atoms/deep/y.md",
+            "notes/z.md",
+            ".cache/c.md",
+        ]:
+            path = tmp_path / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(rel)
+        (tmp_path / "dir.md").mkdir()
+        return tmp_path
+
+    @pytest.mark.parametrize(
+        "pattern",
+        [
+            "*.md",
+            "**/*.md",
+            "atoms/*.md",
+            "atoms/**/*.md",
+            "**",
+            "*/*.md",
+            "atoms/2025-*.md",
+            "[an]*/*.md",
+            ".*.md",
+            "a.md",
+            "missing/*.md",
+            "atoms/deep/y.md",
+        ],
+    )
+    def test_matches_glob_module(self, tree: Path, pattern: str) -> None:
+        """Results match glob.glob filtered to regular files."""
+        expected = sorted(
+            p
+            for p in glob.glob(str(tree / pattern), recursive=True)
+            if os.path.isfile(p)
+        )
+
+        result = glob_files(tree, pattern, DirectoryListingCache())
+
+        assert sorted(str(p) for p in result) == expected
+
+    def test_cached_listing_reused_until_mtime_changes(self, tree: Path) -> None:
+        """Unchanged directory mtimes serve listings from the cache."""
+        cache = DirectoryListingCache()
+        atoms = tree / "atoms"
+        old = atoms.stat().st_mtime_ns - 10_000_000_000
+        os.utime(atoms, ns=(old, old))
+        glob_files(tree, "atoms/*.md", cache)
+
+        # New entry with the mtime pinned back: stale listing is reused
+        (atoms / "new.md").write_text("new")
+        os.utime(atoms, ns=(old, old))
+        assert atoms / "new.md" not in glob_files(tree, "atoms/*.md", cache)
+
+        # mtime moves on: listing is refreshed
+        os.utime(atoms, ns=(old + 1, old + 1))
+        assert atoms / "new.md" in glob_files(tree, "atoms/*.md", cache)
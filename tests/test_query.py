@@ -1,12 +1,19 @@
 """Tests for DuckDB query module."""
 
-from datetime import date
+from datetime import date, datetime
 from typing import Any
 from unittest.mock import MagicMock
 
+import duckdb
 import numpy as np
-
-from frontmatter_mcp.query import create_base_connection, execute_query
+import pytest
+
+from frontmatter_mcp.query import (
+    FilesTableCache,
+    create_base_connection,
+    execute_query,
+    needs_private_database,
+)
 from frontmatter_mcp.semantic import add_semantic_columns
 from frontmatter_mcp.semantic.context import SemanticContext
 
@@ -17,7 +24,12 @@ def create_mock_semantic_context(
 ) -> SemanticContext:
     """Create a mock SemanticContext for testing."""
     mock_cache = MagicMock()
-    mock_cache.get_all_readonly.return_value = embeddings
+    matrix = (
+        np.stack(list(embeddings.values()))
+        if embeddings
+        else np.empty((0, 0), dtype=np.float32)
+    )
+    mock_cache.get_matrix_readonly.return_value = (list(embeddings), matrix)
     mock_indexer = MagicMock()
     return SemanticContext(model=model, cache=mock_cache, indexer=mock_indexer)
 
@@ -217,6 +229,151 @@ class TestExecuteQuery:
         assert values["d.md"] == "True"
         assert values["e.md"] == '["a", "b"]'
 
+    def test_result_values_match_across_column_types(self) -> None:
+        """Row values are plain Python values for Arrow and fallback types."""
+        records = [{"path": "a.md", "count": "3"}]
+        result = _execute_query_simple(
+            records,
+            """
+            SELECT path, count::INTEGER AS n, [1.5, 2.5] AS nums,
+                   {'k': 1} AS struct_col, map(['k'], [1]) AS map_col
+            FROM files
+            """,
+        )
+
+        row = result["results"][0]
+        assert row["path"] == "a.md"
+        assert row["n"] == 3
+        assert [float(x) for x in row["nums"]] == [1.5, 2.5]
+        assert row["struct_col"] == {"k": 1}
+        assert row["map_col"] == {"k": 1}
+
+    def test_out_of_range_temporal_values(self) -> None:
+        """BC dates, infinity and 24:00:00 come back as fetchall() returns them."""
+        records = [{"path": "a.md"}]
+        result = _execute_query_simple(
+            records,
+            """
+            SELECT TRY_CAST('0000-03-01' AS DATE) AS bc_date,
+                   [DATE '0001-01-01' - 1] AS bc_list,
+                   'infinity'::DATE AS inf_date,
+                   'infinity'::TIMESTAMP AS inf_ts,
+                   TIME '24:00:00' AS midnight
+            FROM files
+            """,
+        )
+
+        row = result["results"][0]
+        assert row["bc_date"] == "0001-03-01 (BC)"
+        assert row["bc_list"] == ["0001-12-31 (BC)"]
+        assert row["inf_date"] == date(9999, 12, 31)
+        assert row["inf_ts"] == datetime(9999, 12, 31, 23, 59, 59, 999999)
+        assert row["midnight"] == "24:00:00"
+
+
+class TestCreateConnection:
+    """Tests for connection isolation on the shared database."""
+
+    def test_connections_have_separate_files_tables(self) -> None:
+        """Each connection sees only its own files table."""
+        conn_a = create_base_connection([{"path": "a.md"}])
+        conn_b = create_base_connection([{"path": "b.md"}])
+
+        assert execute_query(conn_a, "SELECT path FROM files")["results"] == [
+            {"path": "a.md"}
+        ]
+        assert execute_query(conn_b, "SELECT path FROM files")["results"] == [
+            {"path": "b.md"}
+        ]
+        conn_a.close()
+        conn_b.close()
+
+    def test_query_changes_discarded_on_close(self) -> None:
+        """Tables created by a query do not outlive its connection."""
+        conn = create_base_connection([{"path": "a.md"}])
+        execute_query(conn, "CREATE TABLE leaked AS SELECT 1 AS x")
+        conn.close()
+
+        conn = create_base_connection([{"path": "a.md"}])
+        result = execute_query(
+            conn,
+            "SELECT count(*) AS n FROM information_schema.tables "
+            "WHERE table_name = 'leaked'",
+        )
+        assert result["results"] == [{"n": 0}]
+        conn.close()
+
+    def test_private_database_commit_does_not_leak(self) -> None:
+        """A query that commits on its own database leaves the shared one alone."""
+        sql = "COMMIT; CREATE TABLE leaked AS SELECT 1 AS x"
+        assert needs_private_database(sql)
+        conn = create_base_connection([{"path": "a.md"}], private=True)
+        with pytest.raises(duckdb.TransactionException):
+            execute_query(conn, sql)
+        execute_query(conn, "BEGIN; CREATE TABLE leaked AS SELECT 1 AS x; COMMIT")
+        conn.close()
+
+        conn = create_base_connection([{"path": "a.md"}])
+        result = execute_query(
+            conn,
+            "SELECT count(*) AS n FROM information_schema.tables "
+            "WHERE table_name = 'leaked'",
+        )
+        assert result["results"] == [{"n": 0}]
+        conn.close()
+
+    @pytest.mark.parametrize(
+        ("sql", "expected"),
+        [
+            ("SELECT * FROM files", False),
+            ("CREATE TEMP TABLE t AS SELECT 1; SELECT * FROM t", False),
+            ("PRAGMA table_info('files')", False),
+            ("COMMIT; CREATE MACRO m(x) AS x", True),
+            ("SELECT 1; ROLLBACK", True),
+            ("SET GLOBAL threads = 1", True),
+            ("ATTACH ':memory:' AS other", True),
+            ("/* s */ CREATE TEMPORARY SECRET s (TYPE s3)", True),
+            ("SELEC 1", True),
+        ],
+    )
+    def test_needs_private_database(self, sql: str, expected: bool) -> None:
+        """Statements that can escape the query transaction need their own db."""
+        assert needs_private_database(sql) is expected
+
+
+class TestFilesTableCache:
+    """Tests for FilesTableCache class."""
+
+    def test_reuses_table_for_same_records(self) -> None:
+        """Same record objects return the cached table."""
+        cache = FilesTableCache()
+        records = [{"path": "a.md", "title": "A"}]
+
+        table1 = cache.get("*.md", records)
+        table2 = cache.get("*.md", list(records))
+
+        assert table1 is table2
+
+    def test_rebuilds_when_records_change(self) -> None:
+        """Different record objects rebuild the table."""
+        cache = FilesTableCache()
+
+        table1 = cache.get("*.md", [{"path": "a.md", "title": "A"}])
+        table2 = cache.get("*.md", [{"path": "a.md", "title": "B"}])
+
+        assert table1 is not table2
+        assert table2.column("title").to_pylist() == ["B"]
+
+    def test_evicts_least_recently_used(self) -> None:
+        """Entries beyond maxsize are evicted."""
+        cache = FilesTableCache(maxsize=1)
+        records = [{"path": "a.md"}]
+
+        table1 = cache.get("a/*.md", records)
+        cache.get("b/*.md", records)
+
+        assert cache.get("a/*.md", records) is not table1
+
 
 class TestSemanticSearch:
     """Tests for semantic search integration."""
@@ -267,6 +424,34 @@ class TestSemanticSearch:
         assert "query_vec" in result["columns"]
         mock_model.encode.assert_called_with("test query")
 
+    def test_embed_function_on_column_with_nulls(self) -> None:
+        """embed() encodes each row's text and maps NULL to NULL."""
+        records = [
+            {"path": "a.md", "title": "A"},
+            {"path": "b.md"},
+            {"path": "c.md", "title": "C"},
+        ]
+        embeddings = {"a.md": np.random.rand(256).astype(np.float32)}
+
+        mock_model = MagicMock()
+        mock_model.get_dimension.return_value = 256
+        mock_model.encode_batch.side_effect = lambda texts: np.stack(
+            [np.full(256, ord(text), dtype=np.float32) for text in texts]
+        )
+
+        semantic = create_mock_semantic_context(embeddings, mock_model)
+
+        conn = create_base_connection(records)
+        add_semantic_columns(conn, semantic)
+        result = execute_query(
+            conn,
+            "SELECT path, embed(title)[1] AS first FROM files ORDER BY path",
+        )
+
+        firsts = [row["first"] for row in result["results"]]
+        assert firsts == [ord("A"), None, ord("C")]
+        mock_model.encode_batch.assert_called_once()
+
     def test_cosine_similarity_calculation(self) -> None:
         """array_cosine_similarity works with embeddings."""
         # Create embeddings where a.md is more similar to query than b.md
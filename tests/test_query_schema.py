@@ -54,6 +54,17 @@ class TestCreateBaseSchema:
         assert "tech" in schema["category"]["examples"]
         assert "life" in schema["category"]["examples"]
 
+    def test_examples_deduped_by_string_value(self) -> None:
+        """Examples are distinct as the string values queries see."""
+        records = [
+            {"path": "a.md", "v": 1},
+            {"path": "b.md", "v": True},
+            {"path": "c.md", "v": "1"},
+        ]
+        schema = create_base_schema(records)
+
+        assert schema["v"]["examples"] == [1, True]
+
     def test_path_included(self) -> None:
         """Path property should appear in schema."""
         records = [{"path": "a.md", "title": "A"}]
@@ -25,8 +25,8 @@ def _settings_dep() -> dict:
     return {"settings": deps.get_settings()}
 
 
-def _query_deps() -> dict:
-    """Get dependencies for query/query_inspect tools."""
+def _inspect_deps() -> dict:
+    """Get dependencies for query_inspect tool."""
     return {
         "settings": deps.get_settings(),
         "cache": deps.get_file_record_cache(),
@@ -34,6 +34,19 @@ def _query_deps() -> dict:
     }
 
 
+def _query_deps() -> dict:
+    """Get dependencies for query tool."""
+    return {
+        **_inspect_deps(),
+        "table_cache": deps.get_files_table_cache(),
+    }
+
+
+def _batch_deps() -> dict:
+    """Get dependencies for batch_* tools."""
+    return {**_settings_dep(), "post_cache": deps.get_post_cache()}
+
+
 def _semantic_dep() -> dict:
     """Get semantic_ctx dependency for index_* tools."""
     return {"semantic_ctx": deps.get_semantic_ctx()}
@@ -85,14 +98,14 @@ class TestQueryInspect:
 
     def test_basic_schema(self, temp_base_dir: Path) -> None:
         """Get schema from files."""
-        result = server_module.query_inspect.fn(glob="*.md", **_query_deps())
+        result = server_module.query_inspect.fn(glob="*.md", **_inspect_deps())
         assert result["file_count"] == 2
         assert "date" in result["schema"]
         assert "tags" in result["schema"]
 
     def test_recursive_glob(self, temp_base_dir: Path) -> None:
         """Get schema with recursive glob."""
-        result = server_module.query_inspect.fn(glob="**/*.md", **_query_deps())
+        result = server_module.query_inspect.fn(glob="**/*.md", **_inspect_deps())
         assert result["file_count"] == 3
         assert "summary" in result["schema"]
 
@@ -146,6 +159,25 @@ class TestQuery:
         assert result["results"][0]["tag"] == "python"
         assert result["results"][0]["count"] == 2
 
+    def test_committed_changes_do_not_leak(self, temp_base_dir: Path) -> None:
+        """Objects a query commits itself are not visible to later queries."""
+        server_module.query.fn(
+            glob="**/*.md",
+            sql="BEGIN; CREATE MACRO path_len(x) AS length(x); "
+            "CREATE VIEW v AS SELECT 1 AS x; COMMIT; SELECT path_len(path) FROM files",
+            **_query_deps(),
+        )
+
+        result = server_module.query.fn(
+            glob="**/*.md",
+            sql="SELECT "
+            "(SELECT count(*) FROM duckdb_views() WHERE view_name = 'v') AS views, "
+            "(SELECT count(*) FROM duckdb_functions() "
+            "WHERE function_name = 'path_len') AS macros",
+            **_query_deps(),
+        )
+        assert result["results"] == [{"views": 0, "macros": 0}]
+
 
 class TestUpdate:
     """Tests for update tool."""
@@ -197,7 +229,7 @@ class TestBatchUpdate:
     def test_set_property_all_files(self, temp_base_dir: Path) -> None:
         """Set a property on all matching files."""
         result = server_module.batch_update.fn(
-            glob="*.md", set={"status": "reviewed"}, **_settings_dep()
+            glob="*.md", set={"status": "reviewed"}, **_batch_deps()
         )
         assert result["updated_count"] == 2
         assert "a.md" in result["updated_files"]
@@ -209,15 +241,40 @@ class TestBatchUpdate:
     def test_recursive_glob(self, temp_base_dir: Path) -> None:
         """Update all files including subdirectories."""
         result = server_module.batch_update.fn(
-            glob="**/*.md", set={"batch": True}, **_settings_dep()
+            glob="**/*.md", set={"batch": True}, **_batch_deps()
         )
         assert result["updated_count"] == 3
         assert "subdir/c.md" in result["updated_files"]
 
+    def test_noop_update_not_counted(self, temp_base_dir: Path) -> None:
+        """Files whose frontmatter would not change are not reported."""
+        server_module.batch_update.fn(
+            glob="*.md", set={"status": "reviewed"}, **_batch_deps()
+        )
+        result = server_module.batch_update.fn(
+            glob="*.md", set={"status": "reviewed"}, **_batch_deps()
+        )
+        assert result["updated_count"] == 0
+
+    def test_skips_symlink_outside_base_dir(self, temp_base_dir: Path) -> None:
+        """Symlinks resolving outside base_dir are skipped with a warning."""
+        with tempfile.TemporaryDirectory() as outside_dir:
+            outside = Path(outside_dir) / "outside.md"
+            outside.write_text("---\ntitle: Outside\n---\n")
+            (temp_base_dir / "link.md").symlink_to(outside)
+
+            result = server_module.batch_update.fn(
+                glob="*.md", set={"status": "reviewed"}, **_batch_deps()
+            )
+
+            assert "link.md" not in result["updated_files"]
+            assert any("link.md" in w for w in result["warnings"])
+            assert "status" not in frontmatter.load(outside).metadata
+
     def test_unset_property(self, temp_base_dir: Path) -> None:
         """Unset a property from all matching files."""
         result = server_module.batch_update.fn(
-            glob="**/*.md", unset=["tags"], **_settings_dep()
+            glob="**/*.md", unset=["tags"], **_batch_deps()
         )
         assert result["updated_count"] == 3
 
@@ -230,7 +287,7 @@ class TestBatchUpdate:
             glob="**/*.md",
             set={"new_prop": "value"},
             unset=["date"],
-            **_settings_dep(),
+            **_batch_deps(),
         )
         assert result["updated_count"] == 3
 
@@ -241,7 +298,7 @@ class TestBatchUpdate:
     def test_no_matching_files(self, temp_base_dir: Path) -> None:
         """Handle no matching files gracefully."""
         result = server_module.batch_update.fn(
-            glob="*.txt", set={"x": 1}, **_settings_dep()
+            glob="*.txt", set={"x": 1}, **_batch_deps()
         )
         assert result["updated_count"] == 0
         assert result["updated_files"] == []
@@ -249,7 +306,7 @@ class TestBatchUpdate:
     def test_no_warnings_key_when_success(self, temp_base_dir: Path) -> None:
         """Warnings key is absent when all updates succeed."""
         result = server_module.batch_update.fn(
-            glob="*.md", set={"status": "ok"}, **_settings_dep()
+            glob="*.md", set={"status": "ok"}, **_batch_deps()
         )
         assert result["updated_count"] == 2
         assert "warnings" not in result
@@ -262,7 +319,7 @@ class TestBatchUpdate:
         )
 
         result = server_module.batch_update.fn(
-            glob="*.md", set={"status": "ok"}, **_settings_dep()
+            glob="*.md", set={"status": "ok"}, **_batch_deps()
         )
         # a.md and b.md should succeed, malformed.md should fail
         assert result["updated_count"] == 2
@@ -277,7 +334,7 @@ class TestBatchArrayAdd:
     def test_add_value_to_existing_array(self, temp_base_dir: Path) -> None:
         """Add a value to an existing array property."""
         result = server_module.batch_array_add.fn(
-            glob="*.md", property="tags", value="new-tag", **_settings_dep()
+            glob="*.md", property="tags", value="new-tag", **_batch_deps()
         )
         assert result["updated_count"] == 2
         assert "a.md" in result["updated_files"]
@@ -288,7 +345,7 @@ class TestBatchArrayAdd:
     def test_skip_duplicate_value(self, temp_base_dir: Path) -> None:
         """Skip files where value already exists (allow_duplicates=False)."""
         result = server_module.batch_array_add.fn(
-            glob="*.md", property="tags", value="python", **_settings_dep()
+            glob="*.md", property="tags", value="python", **_batch_deps()
         )
         # a.md has [python, mcp], b.md has [duckdb]
         # a.md is skipped (python already exists), b.md is updated
@@ -302,7 +359,7 @@ class TestBatchArrayAdd:
             property="tags",
             value="python",
             allow_duplicates=True,
-            **_settings_dep(),
+            **_batch_deps(),
         )
         assert result["updated_count"] == 2
 
@@ -312,7 +369,7 @@ class TestBatchArrayAdd:
     def test_create_property_if_not_exists(self, temp_base_dir: Path) -> None:
         """Create array property if it doesn't exist."""
         result = server_module.batch_array_add.fn(
-            glob="*.md", property="categories", value="blog", **_settings_dep()
+            glob="*.md", property="categories", value="blog", **_batch_deps()
         )
         assert result["updated_count"] == 2
 
@@ -322,7 +379,7 @@ class TestBatchArrayAdd:
     def test_skip_non_array_property(self, temp_base_dir: Path) -> None:
         """Skip and warn when property is not an array."""
         result = server_module.batch_array_add.fn(
-            glob="*.md", property="date", value="value", **_settings_dep()
+            glob="*.md", property="date", value="value", **_batch_deps()
         )
         assert result["updated_count"] == 0
         assert "warnings" in result
@@ -331,7 +388,10 @@ class TestBatchArrayAdd:
     def test_value_as_array_not_flattened(self, temp_base_dir: Path) -> None:
         """Array value should be added as single element, not flattened."""
         result = server_module.batch_array_add.fn(
-            glob="*.md", property="tags", value=["nested", "array"], **_settings_dep()
+            glob="*.md",
+            property="tags",
+            value=["nested", "array"],
+            **_batch_deps(),
         )
         assert result["updated_count"] == 2
 
@@ -345,7 +405,7 @@ class TestBatchArrayRemove:
     def test_remove_value_from_array(self, temp_base_dir: Path) -> None:
         """Remove a value from array property."""
         result = server_module.batch_array_remove.fn(
-            glob="**/*.md", property="tags", value="python", **_settings_dep()
+            glob="**/*.md", property="tags", value="python", **_batch_deps()
         )
         # a.md and c.md have python tag
         assert result["updated_count"] == 2
@@ -356,7 +416,7 @@ class TestBatchArrayRemove:
     def test_skip_if_value_not_exists(self, temp_base_dir: Path) -> None:
         """Skip files where value doesn't exist."""
         result = server_module.batch_array_remove.fn(
-            glob="*.md", property="tags", value="nonexistent", **_settings_dep()
+            glob="*.md", property="tags", value="nonexistent", **_batch_deps()
         )
         assert result["updated_count"] == 0
         assert "warnings" not in result
@@ -364,7 +424,7 @@ class TestBatchArrayRemove:
     def test_skip_if_property_not_exists(self, temp_base_dir: Path) -> None:
         """Skip files where property doesn't exist."""
         result = server_module.batch_array_remove.fn(
-            glob="*.md", property="categories", value="value", **_settings_dep()
+            glob="*.md", property="categories", value="value", **_batch_deps()
         )
         assert result["updated_count"] == 0
         assert "warnings" not in result
@@ -372,7 +432,7 @@ class TestBatchArrayRemove:
     def test_skip_non_array_property(self, temp_base_dir: Path) -> None:
         """Skip and warn when property is not an array."""
         result = server_module.batch_array_remove.fn(
-            glob="*.md", property="date", value="value", **_settings_dep()
+            glob="*.md", property="date", value="value", **_batch_deps()
         )
         assert result["updated_count"] == 0
         assert "warnings" in result
@@ -388,7 +448,7 @@ class TestBatchArrayReplace:
             property="tags",
             old_value="python",
             new_value="py",
-            **_settings_dep(),
+            **_batch_deps(),
         )
         assert result["updated_count"] == 2
 
@@ -403,11 +463,35 @@ class TestBatchArrayReplace:
             property="tags",
             old_value="nonexistent",
             new_value="new",
-            **_settings_dep(),
+            **_batch_deps(),
         )
         assert result["updated_count"] == 0
         assert "warnings" not in result
 
+    def test_skip_if_new_value_is_identical(self, temp_base_dir: Path) -> None:
+        """Replacing a value with itself does not rewrite files."""
+        result = server_module.batch_array_replace.fn(
+            glob="*.md",
+            property="tags",
+            old_value="python",
+            new_value="python",
+            **_batch_deps(),
+        )
+        assert result["updated_count"] == 0
+
+    def test_replace_first_occurrence_only(self, temp_base_dir: Path) -> None:
+        """Only the first occurrence of old_value is replaced."""
+        (temp_base_dir / "dup.md").write_text("---\ntags: [x, y, x]\n---\n")
+        server_module.batch_array_replace.fn(
+            glob="dup.md",
+            property="tags",
+            old_value="x",
+            new_value="z",
+            **_batch_deps(),
+        )
+        post = frontmatter.load(temp_base_dir / "dup.md")
+        assert post["tags"] == ["z", "y", "x"]
+
     def test_skip_if_property_not_exists(self, temp_base_dir: Path) -> None:
         """Skip files where property doesn't exist."""
         result = server_module.batch_array_replace.fn(
@@ -415,7 +499,7 @@ class TestBatchArrayReplace:
             property="categories",
             old_value="old",
             new_value="new",
-            **_settings_dep(),
+            **_batch_deps(),
         )
         assert result["updated_count"] == 0
         assert "warnings" not in result
@@ -427,7 +511,7 @@ class TestBatchArrayReplace:
             property="date",
             old_value="old",
             new_value="new",
-            **_settings_dep(),
+            **_batch_deps(),
         )
         assert result["updated_count"] == 0
         assert "warnings" in result
@@ -439,7 +523,7 @@ class TestBatchArraySort:
     def test_sort_array_ascending(self, temp_base_dir: Path) -> None:
         """Sort array in ascending order."""
         result = server_module.batch_array_sort.fn(
-            glob="*.md", property="tags", **_settings_dep()
+            glob="*.md", property="tags", **_batch_deps()
         )
         # a.md has [python, mcp] -> [mcp, python] (updated)
         # b.md has [duckdb] (single element, already sorted, skipped)
@@ -452,7 +536,7 @@ class TestBatchArraySort:
     def test_sort_array_descending(self, temp_base_dir: Path) -> None:
         """Sort array in descending order."""
         result = server_module.batch_array_sort.fn(
-            glob="*.md", property="tags", reverse=True, **_settings_dep()
+            glob="*.md", property="tags", reverse=True, **_batch_deps()
         )
         # a.md has [python, mcp] - already descending order (skipped)
         # b.md has [duckdb] (single element, already sorted, skipped)
@@ -461,12 +545,10 @@ class TestBatchArraySort:
     def test_sort_array_descending_updated(self, temp_base_dir: Path) -> None:
         """Sort array in descending order when not already sorted."""
         # First sort ascending
-        server_module.batch_array_sort.fn(
-            glob="*.md", property="tags", **_settings_dep()
-        )
+        server_module.batch_array_sort.fn(glob="*.md", property="tags", **_batch_deps())
         # Now a.md has [mcp, python], reverse should update it
         result = server_module.batch_array_sort.fn(
-            glob="*.md", property="tags", reverse=True, **_settings_dep()
+            glob="*.md", property="tags", reverse=True, **_batch_deps()
         )
         assert result["updated_count"] == 1
 
@@ -476,12 +558,10 @@ class TestBatchArraySort:
     def test_skip_if_already_sorted(self, temp_base_dir: Path) -> None:
         """Skip files where array is already sorted."""
         # First sort
-        server_module.batch_array_sort.fn(
-            glob="*.md", property="tags", **_settings_dep()
-        )
+        server_module.batch_array_sort.fn(glob="*.md", property="tags", **_batch_deps())
         # Second sort should skip
         result = server_module.batch_array_sort.fn(
-            glob="*.md", property="tags", **_settings_dep()
+            glob="*.md", property="tags", **_batch_deps()
         )
         assert result["updated_count"] == 0
 
@@ -490,14 +570,14 @@ class TestBatchArraySort:
         (temp_base_dir / "empty.md").write_text("---\ntags: []\n---\n# Empty")
 
         result = server_module.batch_array_sort.fn(
-            glob="empty.md", property="tags", **_settings_dep()
+            glob="empty.md", property="tags", **_batch_deps()
         )
         assert result["updated_count"] == 0
 
     def test_skip_if_property_not_exists(self, temp_base_dir: Path) -> None:
         """Skip files where property doesn't exist."""
         result = server_module.batch_array_sort.fn(
-            glob="*.md", property="categories", **_settings_dep()
+            glob="*.md", property="categories", **_batch_deps()
         )
         assert result["updated_count"] == 0
         assert "warnings" not in result
@@ -505,7 +585,7 @@ class TestBatchArraySort:
     def test_skip_non_array_property(self, temp_base_dir: Path) -> None:
         """Skip and warn when property is not an array."""
         result = server_module.batch_array_sort.fn(
-            glob="*.md", property="date", **_settings_dep()
+            glob="*.md", property="date", **_batch_deps()
         )
         assert result["updated_count"] == 0
         assert "warnings" in result
@@ -519,7 +599,7 @@ class TestBatchArrayUnique:
         (temp_base_dir / "dup.md").write_text("---\ntags: [a, b, a, c, b]\n---\n# Dup")
 
         result = server_module.batch_array_unique.fn(
-            glob="dup.md", property="tags", **_settings_dep()
+            glob="dup.md", property="tags", **_batch_deps()
         )
         assert result["updated_count"] == 1
         assert "dup.md" in result["updated_files"]
@@ -533,7 +613,7 @@ class TestBatchArrayUnique:
         (temp_base_dir / "order.md").write_text(content)
 
         result = server_module.batch_array_unique.fn(
-            glob="order.md", property="tags", **_settings_dep()
+            glob="order.md", property="tags", **_batch_deps()
         )
         assert result["updated_count"] == 1
 
@@ -543,7 +623,7 @@ class TestBatchArrayUnique:
     def test_skip_if_no_duplicates(self, temp_base_dir: Path) -> None:
         """Skip files where array has no duplicates."""
         result = server_module.batch_array_unique.fn(
-            glob="a.md", property="tags", **_settings_dep()
+            glob="a.md", property="tags", **_batch_deps()
         )
         # a.md has [python, mcp] - no duplicates
         assert result["updated_count"] == 0
@@ -553,14 +633,14 @@ class TestBatchArrayUnique:
         (temp_base_dir / "empty.md").write_text("---\ntags: []\n---\n# Empty")
 
         result = server_module.batch_array_unique.fn(
-            glob="empty.md", property="tags", **_settings_dep()
+            glob="empty.md", property="tags", **_batch_deps()
         )
         assert result["updated_count"] == 0
 
     def test_skip_single_element(self, temp_base_dir: Path) -> None:
         """Skip files with single element array."""
         result = server_module.batch_array_unique.fn(
-            glob="b.md", property="tags", **_settings_dep()
+            glob="b.md", property="tags", **_batch_deps()
         )
         # b.md has [duckdb] - single element
         assert result["updated_count"] == 0
@@ -568,7 +648,7 @@ class TestBatchArrayUnique:
     def test_skip_if_property_not_exists(self, temp_base_dir: Path) -> None:
         """Skip files where property doesn't exist."""
         result = server_module.batch_array_unique.fn(
-            glob="*.md", property="categories", **_settings_dep()
+            glob="*.md", property="categories", **_batch_deps()
         )
         assert result["updated_count"] == 0
         assert "warnings" not in result
@@ -576,7 +656,7 @@ class TestBatchArrayUnique:
     def test_skip_non_array_property(self, temp_base_dir: Path) -> None:
         """Skip and warn when property is not an array."""
         result = server_module.batch_array_unique.fn(
-            glob="*.md", property="date", **_settings_dep()
+            glob="*.md", property="date", **_batch_deps()
         )
         assert result["updated_count"] == 0
         assert "warnings" in result
@@ -604,6 +684,9 @@ class TestSemanticSearchTools:
         mock_model.name = "test-model"
         mock_model.get_dimension.return_value = 256
         mock_model.encode.return_value = np.random.rand(256).astype(np.float32)
+        mock_model.encode_batch.side_effect = lambda texts: np.random.rand(
+            len(texts), 256
+        ).astype(np.float32)
 
         # Create real cache and indexer with mock model
         cache = EmbeddingCache(
@@ -688,7 +771,7 @@ class TestSemanticSearchTools:
         server_module.index_refresh.fn(**_semantic_dep())
         mock_semantic_context.indexer.wait(timeout=5.0)
 
-        result = server_module.query_inspect.fn(glob="**/*.md", **_query_deps())
+        result = server_module.query_inspect.fn(glob="**/*.md", **_inspect_deps())
 
         assert "embedding" in result["schema"]
         assert result["schema"]["embedding"]["type"] == "FLOAT[256]"